@@ -6,9 +6,15 @@ Usage:
 """
 
 import argparse
+import sys
 from pathlib import Path
 
-from src.netmon.notebook_backend import load_data, export_data_for_web
+PROJECT_ROOT = Path(__file__).resolve().parent
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from netmon.notebook_backend import load_data, export_data_for_web
 
 
 def main():
@@ -33,6 +33,7 @@ def main() -> None:
     print("Upload Mbps:", result.upload_mbps)
     print("Ping ms:", result.ping_ms)
     print("Error:", result.error)
+    print("Duration s:", result.duration_s)
 
     # Show raw JSON if success and tool was speedtest-cli (for verification).
     if result.success and result.tool:
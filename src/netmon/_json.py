@@ -0,0 +1,74 @@
+"""JSON encode/decode helpers that prefer orjson and fall back to the stdlib.
+
+Everything here works in bytes so callers can read and write files in binary
+mode regardless of which backend is active.
+"""
+from __future__ import annotations
+
+import dataclasses
+import json
+from datetime import date, datetime
+from typing import IO, Any, Callable, Iterator, Mapping, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None
+
+# Dataclasses are serialized natively by orjson; numpy arrays/scalars need an opt-in.
+_ORJSON_OPTIONS = (orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    if orjson is not None:
+        option = _ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=default, option=option)
+
+    def _fallback(value: Any) -> Any:
+        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            return dataclasses.asdict(value)
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if hasattr(value, "tolist"):
+            return value.tolist()
+        if default is not None:
+            return default(value)
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    return json.dumps(obj, indent=2 if indent else None, default=_fallback).encode("utf-8")
+
+
+def iter_encode(obj: Any, depth: int = 1, default: Optional[Callable[[Any], Any]] = None) -> Iterator[bytes]:
+    """Yield the compact JSON encoding of obj in pieces.
+
+    Mappings and lists are opened up to ``depth`` levels deep so each nested
+    element is encoded on its own; anything deeper is encoded in one call.
+    """
+    if depth > 0 and isinstance(obj, Mapping):
+        yield b"{"
+        for idx, (key, value) in enumerate(obj.items()):
+            yield b"," if idx else b""
+            yield dumps(str(key))
+            yield b":"
+            yield from iter_encode(value, depth - 1, default)
+        yield b"}"
+    elif depth > 0 and isinstance(obj, (list, tuple)):
+        yield b"["
+        for idx, value in enumerate(obj):
+            yield b"," if idx else b""
+            yield from iter_encode(value, depth - 1, default)
+        yield b"]"
+    else:
+        yield dumps(obj, default=default)
+
+
+def dump(obj: Any, fp: IO[bytes], depth: int = 1, default: Optional[Callable[[Any], Any]] = None) -> None:
+    """Stream obj to a binary file handle without building the whole document in memory."""
+    for chunk in iter_encode(obj, depth=depth, default=default):
+        fp.write(chunk)
@@ -1,14 +1,27 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Any, Dict, List
 
+from netmon._json import loads
 from netmon.models import Config, Target
 
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - msgspec is optional
+    msgspec = None
+
 
 def load_config(path: str) -> Config:
-    data = _read_json(path)
+    raw = Path(path).read_bytes()
+    if msgspec is not None:
+        try:
+            # Decodes and validates straight into the Config/Target dataclasses in one C pass.
+            return _normalize(msgspec.json.decode(raw, type=Config, strict=False))
+        except msgspec.ValidationError:
+            pass  # Loosely typed configs (e.g. numeric server ids, host-less targets) use the coercing path.
+
+    data: Dict[str, Any] = loads(raw)
     targets = _parse_targets(data.get("targets", []))
     return Config(
         interval_seconds=float(data.get("interval_seconds", 30)),
@@ -25,9 +38,13 @@ def load_config(path: str) -> Config:
     )
 
 
-def _read_json(path: str) -> Dict[str, Any]:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+def _normalize(config: Config) -> Config:
+    """Apply the same target/server-id rules as the dict path to a typed decode."""
+    config.targets = [
+        Target(name=t.name or t.host, host=t.host, interface=t.interface) for t in config.targets if t.host
+    ]
+    config.speedtest_server_id = config.speedtest_server_id or None
+    return config
 
 
 def _parse_targets(raw: List[Dict[str, Any]]) -> List[Target]:
@@ -1,77 +1,170 @@
 from __future__ import annotations
 
 import sqlite3
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, List, Optional, Tuple
 
 from netmon.models import PingResult, SpeedtestResult
 
+# Plain positional rows, in the SELECT order of the fetch_recent_* queries.
+ResultRow = Tuple[str, str, int, Optional[float], Optional[str], str]
+SpeedtestRow = Tuple[str, int, Optional[float], Optional[float], Optional[float], Optional[str], Optional[str]]
+
+# Module-level statements keep sqlite3's statement cache keyed on one string object per query.
+_INSERT_PING = (
+    "INSERT INTO results (ts_us, target_name, interface, host, success, latency_ms, error) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_INSERT_SPEEDTEST = (
+    "INSERT INTO speedtests (ts_us, tool, success, download_mbps, upload_mbps, ping_ms, error) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+# ts_us is the stored timestamp; ts_utc is a virtual column rendering it as UTC isoformat() text
+# ("YYYY-MM-DDTHH:MM:SS.ffffff+00:00") for ad-hoc queries and the notebook. It is computed on read only.
+_US_TO_ISO_SQL = (
+    "strftime('%Y-%m-%dT%H:%M:%S', ts_us / 1000000, 'unixepoch')"
+    " || printf('.%06d+00:00', ts_us % 1000000)"
+)
+_TABLE_COLUMNS = {
+    "results": """
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ts_us INTEGER NOT NULL,
+        ts_utc TEXT GENERATED ALWAYS AS ({iso}) VIRTUAL,
+        target_name TEXT NOT NULL,
+        interface TEXT,
+        host TEXT NOT NULL,
+        success INTEGER NOT NULL,
+        latency_ms REAL,
+        error TEXT
+    """,
+    "speedtests": """
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ts_us INTEGER NOT NULL,
+        ts_utc TEXT GENERATED ALWAYS AS ({iso}) VIRTUAL,
+        tool TEXT,
+        success INTEGER NOT NULL,
+        download_mbps REAL,
+        upload_mbps REAL,
+        ping_ms REAL,
+        error TEXT
+    """,
+}
+_COPIED_COLUMNS = {
+    "results": "id, target_name, interface, host, success, latency_ms, error",
+    "speedtests": "id, tool, success, download_mbps, upload_mbps, ping_ms, error",
+}
+
+# Conversion for databases that still store the isoformat() text ("YYYY-MM-DDTHH:MM:SS[.ffffff]+00:00", UTC):
+# whole seconds from the first 19 characters (strftime would round .9995+ up), plus the microsecond digits.
+_ISO_TO_US_SQL = (
+    "CAST(strftime('%s', substr(ts_utc, 1, 19)) AS INTEGER) * 1000000"
+    " + CASE WHEN substr(ts_utc, 20, 1) = '.' THEN CAST(substr(ts_utc, 21, 6) AS INTEGER) ELSE 0 END"
+)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Generated columns (ts_utc) need 3.31; PRAGMA table_xinfo, used by the migration, needs 3.26.
+_MIN_SQLITE_VERSION = (3, 31, 0)
+
+# Memory-map up to 256 MiB of the file and keep a 64 MiB page cache (negative cache_size is KiB).
+_MMAP_SIZE_BYTES = 256 * 1024 * 1024
+_CACHE_SIZE_KIB = 64 * 1024
+
+
+def tune_connection(conn: sqlite3.Connection) -> None:
+    """Apply the read-path pragmas shared by the writer and the GUI's reader connection."""
+    conn.execute(f"PRAGMA mmap_size={_MMAP_SIZE_BYTES};")
+    conn.execute(f"PRAGMA cache_size=-{_CACHE_SIZE_KIB};")
+    # Sorts and DISTINCT build temp b-trees; keep them in memory rather than temp files.
+    conn.execute("PRAGMA temp_store=MEMORY;")
+
+
+def to_epoch_us(ts: datetime) -> int:
+    """Exact microseconds since the Unix epoch (naive datetimes are taken as UTC)."""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return (ts - _EPOCH) // timedelta(microseconds=1)
+
 
 class Database:
     def __init__(self, path: Path, check_same_thread: bool = False) -> None:
+        if sqlite3.sqlite_version_info < _MIN_SQLITE_VERSION:
+            raise RuntimeError(
+                f"netmon needs SQLite {'.'.join(map(str, _MIN_SQLITE_VERSION))}+ for its database schema, but this "
+                f"Python is linked against SQLite {sqlite3.sqlite_version}. Use a newer Python build."
+            )
         self.path = path
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(self.path, check_same_thread=check_same_thread)
+        self.conn = sqlite3.connect(self.path, check_same_thread=check_same_thread, cached_statements=256)
+        tune_connection(self.conn)
         self._init_db()
 
     def _init_db(self) -> None:
         self.conn.execute("PRAGMA journal_mode=WAL;")
-        self.conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS results (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts_utc TEXT NOT NULL,
-                target_name TEXT NOT NULL,
-                interface TEXT,
-                host TEXT NOT NULL,
-                success INTEGER NOT NULL,
-                latency_ms REAL,
-                error TEXT
-            )
-            """
-        )
-        self.conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS speedtests (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts_utc TEXT NOT NULL,
-                tool TEXT,
-                success INTEGER NOT NULL,
-                download_mbps REAL,
-                upload_mbps REAL,
-                ping_ms REAL,
-                error TEXT
-            )
-            """
-        )
+        # WAL keeps the database consistent with NORMAL sync; commits no longer fsync each time.
+        self.conn.execute("PRAGMA synchronous=NORMAL;")
+        for table, columns in _TABLE_COLUMNS.items():
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns.format(iso=_US_TO_ISO_SQL)})")
+        self._migrate_text_timestamps()
+        # results.id is the rowid, so recent-N reads are already index lookups; the per-target index
+        # serves DISTINCT target_name / per-target scans, the partial index the successful-speedtest reads.
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_results_target_id ON results(target_name, id)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_speedtests_success_id ON speedtests(id) WHERE success = 1")
         self.conn.commit()
 
+    def _migrate_text_timestamps(self) -> None:
+        """Rebuild tables created while ts_utc was a stored TEXT column so only ts_us is kept on disk."""
+        rebuilt = False
+        for table, columns in _TABLE_COLUMNS.items():
+            # table_xinfo marks generated columns as hidden; a plain ts_utc means the old layout.
+            info = {row[1]: row[6] for row in self.conn.execute(f"PRAGMA table_xinfo({table})")}
+            if info.get("ts_utc") != 0:
+                continue
+            # Tables from before ts_us existed only have the text to convert.
+            ts_us = f"COALESCE(ts_us, {_ISO_TO_US_SQL})" if "ts_us" in info else _ISO_TO_US_SQL
+            copied = _COPIED_COLUMNS[table]
+            with self.conn:
+                # Explicit BEGIN so the CREATE is rolled back along with the copy if anything fails.
+                self.conn.execute("BEGIN")
+                self.conn.execute(f"CREATE TABLE {table}_new ({columns.format(iso=_US_TO_ISO_SQL)})")
+                self.conn.execute(
+                    f"INSERT INTO {table}_new (ts_us, {copied}) SELECT {ts_us}, {copied} FROM {table}"
+                )
+                self.conn.execute(f"DROP TABLE {table}")
+                self.conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+            rebuilt = True
+        if rebuilt:
+            # Hand the pages freed by the dropped text column back to the filesystem.
+            self.conn.execute("VACUUM")
+
     def insert_ping(self, result: PingResult) -> None:
-        self.conn.execute(
-            """
-            INSERT INTO results (ts_utc, target_name, interface, host, success, latency_ms, error)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
+        self.insert_pings([result])
+
+    def insert_pings(self, results: Iterable[PingResult]) -> None:
+        """Insert a batch of ping results with a single commit."""
+        self.conn.executemany(
+            _INSERT_PING,
             (
-                result.ts_utc.isoformat(),
-                result.target_name,
-                result.interface,
-                result.host,
-                int(result.success),
-                result.latency_ms,
-                result.error,
+                (
+                    to_epoch_us(result.ts_utc),
+                    result.target_name,
+                    result.interface,
+                    result.host,
+                    int(result.success),
+                    result.latency_ms,
+                    result.error,
+                )
+                for result in results
             ),
         )
         self.conn.commit()
 
     def insert_speedtest(self, result: SpeedtestResult) -> None:
         self.conn.execute(
-            """
-            INSERT INTO speedtests (ts_utc, tool, success, download_mbps, upload_mbps, ping_ms, error)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
+            _INSERT_SPEEDTEST,
             (
-                result.ts_utc.isoformat(),
+                to_epoch_us(result.ts_utc),
                 result.tool,
                 int(result.success),
                 result.download_mbps,
@@ -82,33 +175,30 @@ class Database:
         )
         self.conn.commit()
 
-    def fetch_recent_results(self, limit: int = 200) -> List[sqlite3.Row]:
+    def fetch_recent_results(self, limit: int = 200) -> List[ResultRow]:
+        # ids are AUTOINCREMENT, so the last `limit` rows sit above MAX(id) - limit; both ends are rowid lookups.
         cur = self.conn.execute(
             """
             SELECT ts_utc, target_name, success, latency_ms, interface, host
             FROM results
-            ORDER BY id DESC
-            LIMIT ?
+            WHERE id > (SELECT COALESCE(MAX(id), 0) - ? FROM results)
+            ORDER BY id ASC
             """,
             (limit,),
         )
-        rows = cur.fetchall()
-        rows.reverse()
-        return rows
+        return cur.fetchall()
 
-    def fetch_recent_speedtests(self, limit: int = 100) -> List[sqlite3.Row]:
+    def fetch_recent_speedtests(self, limit: int = 100) -> List[SpeedtestRow]:
         cur = self.conn.execute(
             """
             SELECT ts_utc, success, download_mbps, upload_mbps, ping_ms, tool, error
             FROM speedtests
-            ORDER BY id DESC
-            LIMIT ?
+            WHERE id > (SELECT COALESCE(MAX(id), 0) - ? FROM speedtests)
+            ORDER BY id ASC
             """,
             (limit,),
         )
-        rows = cur.fetchall()
-        rows.reverse()
-        return rows
+        return cur.fetchall()
 
     def close(self) -> None:
         try:
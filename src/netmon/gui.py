@@ -5,7 +5,13 @@ import sqlite3
 import threading
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from netmon.database import tune_connection
+
+# Rolling history kept in memory for the plots (rows across all targets / speedtest rows).
+_PING_HISTORY_ROWS = 400
+_SPEEDTEST_HISTORY_ROWS = 200
 
 
 class MonitorGUI:
@@ -20,6 +26,10 @@ class MonitorGUI:
         self.refresh_seconds = refresh_seconds
         self.window_minutes = window_minutes
         self.target_names = target_names or []
+        # Highest row ids already plotted; refreshes only query rows past these.
+        self._last_id = 0
+        self._last_speedtest_id = 0
+        self._lines: Dict[str, object] = {}
 
     def run(self, stop_event: threading.Event) -> None:
         try:
@@ -29,6 +39,8 @@ class MonitorGUI:
             from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
             from matplotlib.figure import Figure
             import matplotlib.dates as mdates
+            import numpy as np
+            from dateutil import tz as dateutil_tz
         except ImportError as exc:
             logging.error(
                 "GUI requires tkinter and matplotlib. Install matplotlib with `pip install matplotlib`. Error: %s",
@@ -36,14 +48,15 @@ class MonitorGUI:
             )
             return
 
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
+        # Read-only: the GUI never writes, so it cannot contend for the writer's lock.
+        conn = sqlite3.connect(
+            f"{Path(self.db_path).resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False
+        )
+        tune_connection(conn)
 
-        def parse_ts(ts: str) -> datetime:
-            dt = datetime.fromisoformat(ts)
-            if dt.tzinfo:
-                dt = dt.astimezone().replace(tzinfo=None)
-            return dt
+        def decode_ts(values: Sequence[int]) -> "np.ndarray":
+            """Turn stored epoch microseconds into naive UTC datetime64[us] values; no string parsing."""
+            return np.array(values, dtype=np.int64).astype("datetime64[us]")
 
         root = tk.Tk()
         root.title("Network Monitor")
@@ -72,167 +85,190 @@ class MonitorGUI:
         status = ttk.Label(root, text="Initializing...")
         status.pack(fill="x")
 
+        # Create every artist once; refreshes only swap their data.
+        empty_times = np.empty(0, dtype="datetime64[us]")
+        empty_values = np.empty(0, dtype=np.float64)
+        # Data stays in UTC; ticks are placed and labelled in local time, each with the offset in force at that instant.
+        local_tz = dateutil_tz.tzlocal()
+        time_format = mdates.DateFormatter("%H:%M:%S", tz=local_tz)
+        for ax in axes:
+            ax.xaxis_date(tz=local_tz)
+            ax.xaxis.set_major_formatter(time_format)
+            ax.grid(True, alpha=0.3)
+        for ax_ping, name in zip(ping_axes, names):
+            ax_ping.set_ylabel(f"{name}\nms")
+        ax_speed.set_ylabel("Speed (Mbps)")
+        ax_speed_ping.set_ylabel("Speedtest Ping (ms)")
+
+        ping_history = max(1, _PING_HISTORY_ROWS // len(names))
+        ping_series: Dict[str, Tuple["np.ndarray", "np.ndarray", "np.ndarray"]] = {}
+        fail_lines: Dict[str, object] = {}
+        legend_labels: Dict[int, Tuple[str, ...]] = {}
+        ping_placeholders = []
+        for ax_ping, name in zip(ping_axes, names):
+            ping_series[name] = (empty_times, empty_values, np.empty(0, dtype=np.int8))
+            self._lines[name], = ax_ping.plot(empty_times, empty_values, "-o", markersize=3, label="latency")
+            fail_lines[name], = ax_ping.plot(empty_times, empty_values, "x", color="red", label="fail")
+            ping_placeholders.append(
+                ax_ping.text(0.5, 0.5, "No ping data yet", ha="center", va="center", transform=ax_ping.transAxes)
+            )
+
+        speed_series = (empty_times, empty_values, empty_values, empty_values)
+        line_down, = ax_speed.plot(empty_times, empty_values, "-o", markersize=4, label="Download (Mbps)", color="#1f77b4")
+        line_up, = ax_speed.plot(empty_times, empty_values, "-o", markersize=4, label="Upload (Mbps)", color="#2ca02c")
+        line_speed_ping, = ax_speed_ping.plot(
+            empty_times, empty_values, "-o", markersize=4, label="Ping (ms)", color="#ff7f0e"
+        )
+        speed_placeholder = ax_speed.text(0.5, 0.5, "", ha="center", va="center", transform=ax_speed.transAxes)
+        speed_ping_placeholder = ax_speed_ping.text(
+            0.5, 0.5, "", ha="center", va="center", transform=ax_speed_ping.transAxes
+        )
+
+        # Start from the most recent rows instead of replaying the whole table.
+        self._last_id, self._last_speedtest_id = conn.execute(
+            """
+            SELECT
+                MAX(0, (SELECT COALESCE(MAX(id), 0) FROM results) - ?),
+                MAX(0, (SELECT COALESCE(MAX(id), 0) FROM speedtests) - ?)
+            """,
+            (_PING_HISTORY_ROWS, _SPEEDTEST_HISTORY_ROWS),
+        ).fetchone()
+        speedtests_seen = False
+        first_refresh = True
+
+        def set_legend(ax, handles: list) -> None:
+            labels = tuple(h.get_label() for h in handles)
+            if legend_labels.get(id(ax)) == labels:
+                return
+            legend_labels[id(ax)] = labels
+            if handles:
+                ax.legend(handles=handles, labels=list(labels), loc="upper left", bbox_to_anchor=(1.01, 1))
+            elif ax.get_legend() is not None:
+                ax.get_legend().remove()
+
         def refresh_plots() -> None:
-            now = datetime.now()
+            nonlocal speed_series, speedtests_seen, first_refresh
+            # Naive UTC, the same frame as the plotted arrays and the x limits derived from them.
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
             default_span = timedelta(minutes=self.window_minutes)
 
             rows = conn.execute(
                 """
-                SELECT ts_utc, target_name, success, latency_ms
+                SELECT id, ts_us, target_name, success, latency_ms
                 FROM results
-                ORDER BY id DESC
-                LIMIT 400
+                WHERE id > ?
+                ORDER BY id
+                """,
+                (self._last_id,),
+            ).fetchall()
+            st_rows = conn.execute(
                 """
+                SELECT id, ts_us, download_mbps, upload_mbps, ping_ms
+                FROM speedtests
+                WHERE id > ? AND success = 1
+                ORDER BY id
+                """,
+                (self._last_speedtest_id,),
             ).fetchall()
-            rows = list(reversed(rows))
-
-            for ax in ping_axes:
-                ax.clear()
+            newly_seen = False
+            if not speedtests_seen:
+                # Failed runs never reach the plots but still change the placeholder message.
+                newly_seen = speedtests_seen = conn.execute("SELECT EXISTS(SELECT 1 FROM speedtests)").fetchone()[0] == 1
 
-            axis_rights: Dict[int, float] = {}
-            window_start_ping = now - default_span
+            if not rows and not st_rows and not newly_seen and not first_refresh:
+                status.config(text=f"Last update: {datetime.now().strftime('%H:%M:%S')} (no new data)")
+                return
+            first_refresh = False
 
             if rows:
-                window_start_ping = min(parse_ts(r["ts_utc"]) for r in rows)
+                # Plain tuples in SELECT order; transpose into columns in one C-level pass.
+                ids, ts_values, target_names, successes, latencies = zip(*rows)
+                self._last_id = ids[-1]
+                times = decode_ts(ts_values)
+                success = np.array(successes, dtype=np.int8)
+                latency = np.array(latencies, dtype=np.float64)
+                latency[success == 0] = 0.0
                 per_target: Dict[str, list] = {}
-                for r in rows:
-                    per_target.setdefault(r["target_name"], []).append(r)
-
-                for idx, name in enumerate(names):
-                    if idx >= len(ping_axes):
-                        break
-                    ax_ping = ping_axes[idx]
-                    items = per_target.get(name, [])
-                    times_all = [parse_ts(i["ts_utc"]) for i in items]
-                    latencies_all = [i["latency_ms"] if i["success"] else 0.0 for i in items]
-
-                    handles: list = []
-                    labels: list = []
-                    if times_all:
-                        h, = ax_ping.plot(times_all, latencies_all, "-o", markersize=3, label="latency")
-                        handles.append(h)
-                        labels.append(h.get_label())
-                        # Highlight failures on top of the connected line.
-                        fail_times = [t for t, i in zip(times_all, items) if not i["success"]]
-                        if fail_times:
-                            h_fail = ax_ping.plot(fail_times, [0.0] * len(fail_times), "x", color="red", label="fail")[0]
-                            handles.append(h_fail)
-                            labels.append(h_fail.get_label())
-
-                    ax_ping.set_ylabel(f"{name}\nms")
-                    ax_ping.grid(True, alpha=0.3)
-                    if handles:
-                        ax_ping.legend(handles=handles, labels=labels, loc="upper left", bbox_to_anchor=(1.01, 1))
-                    latest_ts = max([parse_ts(i["ts_utc"]) for i in items], default=now)
+                for pos, target_name in enumerate(target_names):
+                    per_target.setdefault(target_name, []).append(pos)
+
+                for name, positions in per_target.items():
+                    if name not in ping_series:
+                        continue
+                    sel = np.fromiter(positions, dtype=np.intp, count=len(positions))
+                    old_times, old_latencies, old_success = ping_series[name]
+                    ping_series[name] = (
+                        np.concatenate([old_times, times[sel]])[-ping_history:],
+                        np.concatenate([old_latencies, latency[sel]])[-ping_history:],
+                        np.concatenate([old_success, success[sel]])[-ping_history:],
+                    )
+
+            axis_rights: Dict[int, datetime] = {}
+            window_start_ping = now - default_span
+            plotted = [series[0] for series in ping_series.values() if series[0].size]
+            if plotted:
+                window_start_ping = min(t.min() for t in plotted).item()
+
+            for ax_ping, name, placeholder in zip(ping_axes, names, ping_placeholders):
+                times_all, latencies_all, success_all = ping_series[name]
+                line = self._lines[name]
+                fail_line = fail_lines[name]
+                line.set_data(times_all, latencies_all)
+                # Highlight failures on top of the connected line.
+                fail_times = times_all[success_all == 0]
+                fail_line.set_data(fail_times, np.zeros(fail_times.size))
+                placeholder.set_visible(not plotted)
+                if plotted:
+                    handles = [line] if times_all.size else []
+                    if fail_times.size:
+                        handles.append(fail_line)
+                    set_legend(ax_ping, handles)
+                    latest_ts = times_all.max().item() if times_all.size else now
                     span = max(timedelta(seconds=1), latest_ts - window_start_ping)
-                    right = window_start_ping + span / 0.9  # place latest point ~90% across axis
-                    ax_ping.set_xlim(left=window_start_ping, right=right)
-                    axis_rights[id(ax_ping)] = right
-            else:
-                for ax_ping in ping_axes:
-                    ax_ping.text(0.5, 0.5, "No ping data yet", ha="center", va="center", transform=ax_ping.transAxes)
-                    ax_ping.set_ylabel("Latency (ms)")
-                    ax_ping.grid(True, alpha=0.3)
+                    axis_rights[id(ax_ping)] = window_start_ping + span / 0.9  # place latest point ~90% across axis
 
-            st_rows = conn.execute(
-                """
-                SELECT ts_utc, success, download_mbps, upload_mbps, ping_ms
-                FROM speedtests
-                ORDER BY id DESC
-                LIMIT 200
-                """
-            ).fetchall()
-            st_rows = [r for r in reversed(st_rows)]
-            ax_speed.clear()
-            ax_speed_ping.clear()
-            handles_speed: list = []
-            labels_speed: list = []
-            times_speed: List[datetime] = []
-            times_speed_ping: List[datetime] = []
-            ping_handles: list = []
-            ping_labels: list = []
-            window_start_speed = now - default_span
-            window_start_speed_ping = now - default_span
             if st_rows:
-                filtered = [
-                    (
-                        parse_ts(r["ts_utc"]),
-                        r["download_mbps"],
-                        r["upload_mbps"],
-                        r["ping_ms"],
-                    )
-                    for r in st_rows
-                    if r["success"]
-                ]
-                times_speed = [t for t, _, _, _ in filtered]
-                downs = [d for _, d, _, _ in filtered]
-                ups = [u for _, _, u, _ in filtered]
-                pings = [p for _, _, _, p in filtered]
-
-                if times_speed:
-                    window_start_speed = min(times_speed)
-                    h1, = ax_speed.plot(times_speed, downs, "-o", markersize=4, label="Download (Mbps)", color="#1f77b4")
-                    h2, = ax_speed.plot(times_speed, ups, "-o", markersize=4, label="Upload (Mbps)", color="#2ca02c")
-                    handles_speed.extend([h1, h2])
-                    labels_speed.extend([h.get_label() for h in (h1, h2)])
-
-                    hp, = ax_speed_ping.plot(times_speed, pings, "-o", markersize=4, label="Ping (ms)", color="#ff7f0e")
-                    ping_handles.append(hp)
-                    ping_labels.append(hp.get_label())
-                    times_speed_ping = times_speed
-                    window_start_speed_ping = min(times_speed_ping)
-                else:
-                    ax_speed.text(
-                        0.5,
-                        0.5,
-                        "No successful speedtests yet",
-                        ha="center",
-                        va="center",
-                        transform=ax_speed.transAxes,
-                    )
-                    ax_speed_ping.text(
-                        0.5,
-                        0.5,
-                        "No successful speedtests yet",
-                        ha="center",
-                        va="center",
-                        transform=ax_speed_ping.transAxes,
-                    )
+                st_ids, st_ts_values, downs, ups, pings = zip(*st_rows)
+                self._last_speedtest_id = st_ids[-1]
+                values = np.array((downs, ups, pings), dtype=np.float64)
+                new_series = (decode_ts(st_ts_values), *values)
+                speed_series = tuple(
+                    np.concatenate([old, new])[-_SPEEDTEST_HISTORY_ROWS:] for old, new in zip(speed_series, new_series)
+                )
+
+            times_speed, downs, ups, pings = speed_series
+            line_down.set_data(times_speed, downs)
+            line_up.set_data(times_speed, ups)
+            line_speed_ping.set_data(times_speed, pings)
+            if times_speed.size:
+                message = ""
+            elif speedtests_seen:
+                message = "No successful speedtests yet"
             else:
-                ax_speed.text(0.5, 0.5, "No speedtests recorded", ha="center", va="center", transform=ax_speed.transAxes)
-                ax_speed_ping.text(0.5, 0.5, "No speedtests recorded", ha="center", va="center", transform=ax_speed_ping.transAxes)
-
-            ax_speed.set_ylabel("Speed (Mbps)")
-            ax_speed.grid(True, alpha=0.3)
-            ax_speed_ping.set_ylabel("Speedtest Ping (ms)")
-            ax_speed_ping.grid(True, alpha=0.3)
-            if handles_speed:
-                ax_speed.legend(handles=handles_speed, labels=labels_speed, loc="upper left", bbox_to_anchor=(1.01, 1))
-            if ping_handles:
-                ax_speed_ping.legend(handles=ping_handles, labels=ping_labels, loc="upper left", bbox_to_anchor=(1.01, 1))
-
-            latest_ts_speed = max(times_speed, default=now)
+                message = "No speedtests recorded"
+            for placeholder in (speed_placeholder, speed_ping_placeholder):
+                placeholder.set_text(message)
+                placeholder.set_visible(bool(message))
+            set_legend(ax_speed, [line_down, line_up] if times_speed.size else [])
+            set_legend(ax_speed_ping, [line_speed_ping] if times_speed.size else [])
+
+            window_start_speed = times_speed.min().item() if times_speed.size else now - default_span
+            latest_ts_speed = times_speed.max().item() if times_speed.size else now
             span_speed = max(timedelta(seconds=1), latest_ts_speed - window_start_speed)
             right_speed = window_start_speed + span_speed / 0.9
 
-            latest_ts_speed_ping = max(times_speed_ping, default=now)
-            span_speed_ping = max(timedelta(seconds=1), latest_ts_speed_ping - window_start_speed_ping)
-            right_speed_ping = window_start_speed_ping + span_speed_ping / 0.9
-
-            for ax in [*ping_axes, ax_speed, ax_speed_ping]:
-                ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M:%S"))
+            for ax in axes:
                 ax.relim()
                 ax.autoscale_view()
-                if ax is ax_speed:
+                if ax is ax_speed or ax is ax_speed_ping:
                     ax.set_xlim(left=window_start_speed, right=right_speed)
-                elif ax is ax_speed_ping:
-                    ax.set_xlim(left=window_start_speed_ping, right=right_speed_ping)
                 else:
                     right = axis_rights.get(id(ax), window_start_ping + default_span)
                     ax.set_xlim(left=window_start_ping, right=right)
             fig.autofmt_xdate(rotation=30, ha="right")
 
             status.config(text=f"Last update: {datetime.now().strftime('%H:%M:%S')}")
+            # Axis limits and tick labels move with every new point, so a partial blit would leave stale ticks.
             canvas.draw_idle()
 
         def on_close() -> None:
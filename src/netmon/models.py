@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Optional
 
@@ -14,17 +14,18 @@ class Target:
 
 @dataclass
 class Config:
-    interval_seconds: float
-    ping_timeout: float
-    targets: List[Target]
-    db_path: str
-    log_path: str
-    enable_speedtest: bool
-    speedtest_interval_seconds: float
-    speedtest_timeout_seconds: float
-    speedtest_server_id: Optional[str]
-    gui_refresh_seconds: float
-    gui_window_minutes: float
+    # Defaults mirror config_loader so a typed decode can fill in missing keys.
+    interval_seconds: float = 30.0
+    ping_timeout: float = 3.0
+    targets: List[Target] = field(default_factory=list)
+    db_path: str = "data/monitor.db"
+    log_path: str = "logs/monitor.log"
+    enable_speedtest: bool = True
+    speedtest_interval_seconds: float = 1800.0
+    speedtest_timeout_seconds: float = 90.0
+    speedtest_server_id: Optional[str] = None
+    gui_refresh_seconds: float = 5.0
+    gui_window_minutes: float = 60.0
 
 
 @dataclass
@@ -47,3 +48,5 @@ class SpeedtestResult:
     upload_mbps: Optional[float]
     ping_ms: Optional[float]
     error: Optional[str]
+    # Wall time of the CLI run in seconds (monotonic clock); None when no CLI was started.
+    duration_s: Optional[float] = None
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import threading
 import time
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
 from netmon.database import Database
-from netmon.models import Config, Target
-from netmon.pinger import Pinger
+from netmon.models import Config, PingResult, SpeedtestResult, Target
+from netmon.pinger import AsyncPinger
 from netmon.speedtester import SpeedTester
 
 
@@ -16,7 +18,7 @@ class Monitor:
     def __init__(self, config: Config, db_path: Path) -> None:
         self.config = config
         self.db = Database(db_path)
-        self.pinger = Pinger(config.ping_timeout)
+        self.pinger = AsyncPinger(config.ping_timeout)
         self.speedtester: Optional[SpeedTester] = (
             SpeedTester(config.speedtest_timeout_seconds, server_id=config.speedtest_server_id)
             if config.enable_speedtest
@@ -24,34 +26,59 @@ class Monitor:
         )
 
     def run_loop(self, stop_event: threading.Event, run_once: bool = False) -> None:
+        logging.info("Starting network monitor loop")
+        try:
+            asyncio.run(self._run_loop_async(stop_event, run_once))
+        except KeyboardInterrupt:
+            logging.info("Stopping monitor (Ctrl+C pressed)")
+        finally:
+            self.db.close()
+
+    async def _run_loop_async(self, stop_event: threading.Event, run_once: bool) -> None:
+        loop = asyncio.get_running_loop()
         interval = self.config.interval_seconds
         speedtest_interval = self.config.speedtest_interval_seconds
         next_speedtest = 0 if self.speedtester else float("inf")  # run immediately
+        speedtest: Optional[asyncio.Future] = None
 
-        logging.info("Starting network monitor loop")
-        try:
-            while not stop_event.is_set():
-                loop_start = time.time()
-                for target in self.config.targets:
-                    self._check_target(target)
+        while not stop_event.is_set():
+            loop_start = time.time()
+            # gather() keeps target order; the batch is written from the loop thread only.
+            results = await asyncio.gather(*(self._check_target(t) for t in self.config.targets))
+            self.db.insert_pings(results)
 
-                if self.speedtester and loop_start >= next_speedtest:
-                    self._run_speedtest()
-                    next_speedtest = loop_start + speedtest_interval
+            if self.speedtester and loop_start >= next_speedtest and (speedtest is None or speedtest.done()):
+                # The speedtest takes tens of seconds; run it as its own task so pings stay on cadence.
+                speedtest = asyncio.ensure_future(self.speedtester.run_async())
+                speedtest.add_done_callback(self._on_speedtest_done)
+                next_speedtest = loop_start + speedtest_interval
 
-                if run_once:
-                    break
+            if run_once:
+                break
 
-                sleep_for = max(0.0, interval - (time.time() - loop_start))
-                stop_event.wait(sleep_for)
-        except KeyboardInterrupt:
-            logging.info("Stopping monitor (Ctrl+C pressed)")
-        finally:
-            self.db.close()
+            sleep_for = max(0.0, interval - (time.time() - loop_start))
+            # stop_event is set from other threads (GUI, main), so wait on it in a worker.
+            await loop.run_in_executor(None, stop_event.wait, sleep_for)
+
+        if speedtest is not None and not speedtest.done():
+            # Let an in-flight speedtest land in the database before the loop closes.
+            await asyncio.wait([speedtest])
 
-    def _check_target(self, target: Target) -> None:
-        result = self.pinger.ping(target)
-        self.db.insert_ping(result)
+    async def _check_target(self, target: Target) -> PingResult:
+        try:
+            result = await self.pinger.ping_async(target)
+        except Exception as exc:
+            # One broken target must not drop the rest of the batch or stop monitoring.
+            logging.exception("%s: ping crashed", target.name)
+            result = PingResult(
+                ts_utc=datetime.now(timezone.utc),
+                target_name=target.name,
+                interface=target.interface,
+                host=target.host,
+                success=False,
+                latency_ms=None,
+                error=f"ping crashed: {exc!r}",
+            )
         if result.success:
             logging.info(
                 "%s (%s) reachable: %s, latency=%.1f ms",
@@ -68,19 +95,27 @@ class Monitor:
                 target.host,
                 result.error,
             )
+        return result
 
-    def _run_speedtest(self) -> None:
-        if not self.speedtester:
+    def _on_speedtest_done(self, future: asyncio.Future) -> None:
+        if future.cancelled():
             return
-        st_result = self.speedtester.run()
+        exc = future.exception()
+        if exc is not None:
+            logging.error("Speedtest crashed: %s", exc, exc_info=exc)
+            return
+        self._record_speedtest(future.result())
+
+    def _record_speedtest(self, st_result: SpeedtestResult) -> None:
         self.db.insert_speedtest(st_result)
         if st_result.success:
             logging.info(
-                "Speedtest (%s): down=%.2f Mbps up=%.2f Mbps ping=%.1f ms",
+                "Speedtest (%s): down=%.2f Mbps up=%.2f Mbps ping=%.1f ms in %.1fs",
                 st_result.tool or "?",
                 st_result.download_mbps,
                 st_result.upload_mbps,
                 st_result.ping_ms,
+                st_result.duration_s,
             )
         else:
             logging.warning(
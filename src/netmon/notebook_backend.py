@@ -9,15 +9,41 @@ Provides a small API:
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+import os
 import sqlite3
 
+from netmon._json import dump
+
+try:
+    import adbc_driver_sqlite.dbapi as adbc_sqlite
+except ImportError:  # pragma: no cover - exercised only without adbc installed
+    adbc_sqlite = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised only without pyarrow installed
+    pa = pq = None
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - exercised only without numba installed
+    numba = None
+
+CACHE_DIRNAME = ".cache"
+# Bump whenever _load_results/_load_speedtests change their columns or dtypes so old Parquet files are ignored.
+_CACHE_VERSION = 4
+
 
 @dataclass
 class DataBundle:
@@ -31,6 +57,32 @@ class DataBundle:
     result_spans: Dict[str, Tuple[pd.Timestamp, pd.Timestamp]]
     speedtest_spans: Dict[str, Tuple[pd.Timestamp, pd.Timestamp]]
 
+    # Derived once per bundle; assign a new results frame rather than mutating it in place.
+    @cached_property
+    def success_mask(self) -> np.ndarray:
+        return self.results["success"].to_numpy() == 1
+
+    @cached_property
+    def failure_mask(self) -> np.ndarray:
+        return ~self.success_mask
+
+    @cached_property
+    def failed_results(self) -> pd.DataFrame:
+        return self.results[self.failure_mask]
+
+    @cached_property
+    def palette_hex(self) -> Dict[str, str]:
+        """dataset_colors as "#rrggbb" strings for the web export."""
+        palette = {}
+        for ds, color in self.dataset_colors.items():
+            if isinstance(color, tuple) and len(color) >= 3:
+                # Convert matplotlib RGB (0-1) to hex
+                r, g, b = int(color[0] * 255), int(color[1] * 255), int(color[2] * 255)
+                palette[ds] = f"#{r:02x}{g:02x}{b:02x}"
+            else:
+                palette[ds] = color
+        return palette
+
 
 def _find_project_root(start: Optional[Path] = None) -> Path:
     """Locate the repo root by finding the sibling/child data directory."""
@@ -43,72 +95,213 @@ def _find_project_root(start: Optional[Path] = None) -> Path:
     return here
 
 
-def _load_results(db_path: Path) -> pd.DataFrame:
-    query = """
-        SELECT ts_utc, target_name, interface, host, success, latency_ms, error
-        FROM results
-        ORDER BY ts_utc ASC
+def _read_sql(db_path: Path, query: str) -> pd.DataFrame:
+    """Run a query against one DB; Arrow bulk fetch through ADBC when installed, DB-API rows otherwise."""
+    if adbc_sqlite is not None:
+        with adbc_sqlite.connect(str(db_path)) as conn, conn.cursor() as cur:
+            cur.execute(query)
+            return cur.fetch_arrow_table().to_pandas()
+    with closing(sqlite3.connect(db_path)) as conn:
+        return pd.read_sql_query(query, conn)
+
+
+# Column -> in-memory dtype for the loaders. success is a 0/1 flag, so int8 keeps it small; the measurements stay
+# float64 so summary stats and exported values match the stored REALs. Error text stays in the DB since nothing reads it.
+# The timestamp column is added by _read_table to suit the table's layout.
+_RESULT_COLUMNS = {
+    "target_name": object,
+    "interface": object,
+    "host": object,
+    "success": np.int8,
+    "latency_ms": np.float64,
+}
+_SPEEDTEST_COLUMNS = {
+    "tool": object,
+    "success": np.int8,
+    "download_mbps": np.float64,
+    "upload_mbps": np.float64,
+    "ping_ms": np.float64,
+}
+_CHUNK_ROWS = 200_000
+
+
+def _stores_ts_us(conn: sqlite3.Connection, table: str) -> bool:
+    """True once table keeps integer ts_us and ts_utc is only the virtual text rendering of it."""
+    # table_xinfo marks generated columns as hidden; a plain ts_utc means the Database has not migrated the file.
+    info = {row[1]: row[6] for row in conn.execute(f"PRAGMA table_xinfo({table})")}
+    return "ts_us" in info and info.get("ts_utc") != 0
+
+
+def _read_table(db_path: Path, table: str, columns: Mapping[str, type]) -> pd.DataFrame:
+    """Read columns of table in insertion order, already in their target dtypes, plus a parsed ts_utc.
+
+    Migrated tables are read through ts_us and ordered by id, so SQLite neither formats nor sorts the
+    timestamps; unmigrated files fall back to the stored text. Without ADBC, rows are streamed in chunks
+    into buffers sized up front, so the full result never exists as Python rows and a DataFrame copy at
+    the same time.
     """
-    with sqlite3.connect(db_path) as conn:
-        df = pd.read_sql_query(query, conn, parse_dates=["ts_utc"])
-    df["ts"] = pd.to_datetime(df["ts_utc"])
+    with closing(sqlite3.connect(db_path)) as conn:
+        if _stores_ts_us(conn, table):
+            ts_col, order = "ts_us", "id"
+            columns = {"ts_us": np.int64, **columns}
+        else:
+            ts_col, order = "ts_utc", "ts_utc"
+            columns = {"ts_utc": object, **columns}
+        query = f"SELECT {', '.join(columns)} FROM {table} ORDER BY {order} ASC"
+        if adbc_sqlite is not None:
+            df = _read_sql(db_path, query)
+            df = df.astype({col: dtype for col, dtype in columns.items() if dtype is not object})
+        else:
+            # One read transaction so the count and the rows come from the same snapshot while the monitor writes.
+            conn.execute("BEGIN")
+            n_rows = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            buffers = {col: np.empty(n_rows, dtype=dtype) for col, dtype in columns.items()}
+            pos = 0
+            for chunk in pd.read_sql_query(query, conn, chunksize=_CHUNK_ROWS):
+                end = pos + len(chunk)
+                for col, buf in buffers.items():
+                    values = chunk[col]
+                    buf[pos:end] = values.to_numpy(dtype=buf.dtype, na_value=np.nan) if values.hasnans else values.to_numpy()
+                pos = end
+            df = pd.DataFrame(buffers, copy=False)
+    ts = df.pop(ts_col)
+    if ts_col == "ts_us":
+        ts_utc = pd.to_datetime(ts, unit="us", utc=True)
+    else:
+        # isoformat() drops the fraction when microseconds are zero, so the text is not one fixed format.
+        ts_utc = pd.to_datetime(ts, format="ISO8601")
+    df.insert(0, "ts_utc", ts_utc)
+    return df
+
+
+def _load_results(db_path: Path) -> pd.DataFrame:
+    df = _read_table(db_path, "results", _RESULT_COLUMNS)
+    df["ts"] = df["ts_utc"]  # already parsed; copy-on-write shares the values
     df["dataset"] = db_path.stem
     return df
 
 
 def _load_speedtests(db_path: Path) -> pd.DataFrame:
-    query = """
-        SELECT ts_utc, tool, success, download_mbps, upload_mbps, ping_ms, error
-        FROM speedtests
-        ORDER BY ts_utc ASC
-    """
-    with sqlite3.connect(db_path) as conn:
-        df = pd.read_sql_query(query, conn, parse_dates=["ts_utc"])
-    df["ts"] = pd.to_datetime(df["ts_utc"])
+    df = _read_table(db_path, "speedtests", _SPEEDTEST_COLUMNS)
+    df["ts"] = df["ts_utc"]
     df["dataset"] = db_path.stem
     return df
 
 
-def _compute_spans(df: pd.DataFrame, ts_col: str = "ts") -> Dict[str, Tuple[pd.Timestamp, pd.Timestamp]]:
-    spans: Dict[str, Tuple[pd.Timestamp, pd.Timestamp]] = {}
-    for ds, g in df.groupby("dataset"):
-        ts = g[ts_col].sort_values()
-        if ts.empty:
+def _cache_key(db_path: Path) -> str:
+    """Change whenever the DB or its WAL changes; WAL-mode writes can leave the main file's mtime alone."""
+    parts = []
+    for path in (db_path, db_path.with_name(db_path.name + "-wal")):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
             continue
-        spans[ds] = (ts.iloc[0], ts.iloc[-1])
-    return spans
+        parts.append(f"{stat.st_mtime_ns:x}_{stat.st_size:x}")
+    return "-".join(parts)
+
+
+def _cached_load(db_path: Path, kind: str, loader) -> pd.DataFrame:
+    """Run loader(db_path), reusing a Parquet copy of its result while the DB is unchanged."""
+    if pq is None:
+        return loader(db_path)
+    cache_dir = db_path.parent / CACHE_DIRNAME
+    cache = cache_dir / f"{db_path.stem}.{kind}.v{_CACHE_VERSION}.{_cache_key(db_path)}.parquet"
+    if cache.exists():
+        return pq.read_table(cache, memory_map=True).to_pandas()
+    df = loader(db_path)
+    try:
+        cache_dir.mkdir(exist_ok=True)
+        for stale in cache_dir.glob(f"{db_path.stem}.{kind}.*.parquet"):
+            stale.unlink()
+        tmp = cache.with_suffix(f".{os.getpid()}.tmp")
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp, compression="zstd")
+        os.replace(tmp, cache)
+    except OSError:
+        pass  # A read-only data dir just means no cache.
+    return df
 
 
-def _round_sigfigs(value: Optional[float], sig: int = 3) -> Optional[float]:
-    if value is None or (isinstance(value, float) and np.isnan(value)):
-        return None
-    try:
-        if value == 0:
-            return 0.0
-        from math import log10, floor
-
-        return round(value, sig - int(floor(log10(abs(value)))) - 1)
-    except Exception:
-        return value
-
-
-def _add_gap_breaks(points: List[dict], gap_threshold_seconds: Optional[float]) -> List[dict]:
-    """Insert null points when time gaps exceed threshold to prevent line interpolation."""
-    if not points or not gap_threshold_seconds:
-        return points
-    out: List[dict] = [points[0]]
-    prev_ts = pd.to_datetime(points[0]["x"])
-    for point in points[1:]:
-        curr_ts = pd.to_datetime(point["x"])
-        delta = (curr_ts - prev_ts).total_seconds()
-        if delta > gap_threshold_seconds:
-            mid_ts = prev_ts + pd.Timedelta(seconds=delta / 2.0)
-            out.append({"x": mid_ts.isoformat(), "y": None})
-        out.append(point)
-        prev_ts = curr_ts
+def _load_db(db_path: Path) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    return _cached_load(db_path, "results", _load_results), _cached_load(db_path, "speedtests", _load_speedtests)
+
+
+def _compute_spans(df: pd.DataFrame, ts_col: str = "ts") -> Dict[str, Tuple[pd.Timestamp, pd.Timestamp]]:
+    bounds = df.groupby("dataset", observed=True)[ts_col].agg(["min", "max"]).dropna()
+    return {ds: (start, end) for ds, start, end in zip(bounds.index, bounds["min"], bounds["max"])}
+
+
+def _add_gap_breaks(
+    ts: np.ndarray, y: np.ndarray, gap_threshold_seconds: Optional[float]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Insert NaN points midway across time gaps that exceed threshold to prevent line interpolation.
+
+    ts is a datetime64[ns] array and y a float array of the same length; new arrays are returned.
+    """
+    if not ts.size or not gap_threshold_seconds:
+        return ts, y
+    deltas = np.diff(ts.view(np.int64))
+    gap_idx = np.flatnonzero(deltas / 1e9 > gap_threshold_seconds)
+    if not gap_idx.size:
+        return ts, y
+    mids = ts[gap_idx] + (deltas[gap_idx] // 2).astype("timedelta64[ns]")
+    return np.insert(ts, gap_idx + 1, mids), np.insert(y.astype(np.float64), gap_idx + 1, np.nan)
+
+
+def _iso_utc(ts: np.ndarray) -> np.ndarray:
+    """Format UTC datetime64[ns] values like Timestamp.isoformat(), without a per-value Timestamp."""
+    full = np.datetime_as_string(ts, unit="ns")
+    ns = ts.view(np.int64) % 1_000_000_000
+    # isoformat() prints nanoseconds only when present, and drops a zero fraction entirely.
+    text = np.where(ns % 1000 != 0, full, np.where(ns != 0, full.astype("U26"), full.astype("U19")))
+    return np.char.add(text, "+00:00")
+
+
+def _iso_or_none(col: pd.Series) -> List[Optional[str]]:
+    iso = _iso_utc(col.to_numpy("datetime64[ns]")).astype(object)
+    iso[col.isna().to_numpy()] = None
+    return iso.tolist()
+
+
+def _round_sigfigs_array(values: np.ndarray, sig: int = 3) -> np.ndarray:
+    """Round each value to ``sig`` significant figures; NaN stays NaN and zero stays zero.
+
+    Goes through "%g" text rather than np.round, which scales by a power of ten first and so
+    mis-rounds decimal ties such as 7.595; the text round trip matches Python's round().
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = values.copy()
+    nz = np.isfinite(values) & (values != 0)
+    out[nz] = np.char.mod(f"%.{sig}g", values[nz]).astype(np.float64)
     return out
 
 
+def _summary_records(summary: pd.DataFrame) -> List[dict]:
+    """Summary rows as JSON-ready dicts: timestamps as isoformat, durations in seconds, missing values as None.
+
+    Each column is converted in one pass before the rows are zipped together; numbers keep their native value.
+    """
+    columns = []
+    for _, col in summary.items():
+        if pd.api.types.is_datetime64_any_dtype(col):
+            columns.append(_iso_or_none(col))
+            continue
+        if pd.api.types.is_timedelta64_dtype(col):
+            col = pd.Series(_round_sigfigs_array(col.dt.total_seconds().to_numpy()), index=col.index)
+        values = col.tolist()
+        for pos in np.flatnonzero(col.isna().to_numpy()):
+            values[pos] = None
+        columns.append(values)
+    names = summary.columns.tolist()
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def _points(ts: np.ndarray, y: np.ndarray) -> List[dict]:
+    rounded = _round_sigfigs_array(y)
+    y_values = rounded.astype(object)
+    y_values[np.isnan(rounded)] = None
+    return [{"x": x, "y": v} for x, v in zip(_iso_utc(ts).tolist(), y_values.tolist())]
+
+
 def load_data(
     project_root: Optional[Path] = None,
     dataset_descriptions: Optional[Mapping[str, str]] = None,
@@ -132,10 +325,22 @@ def load_data(
     default_desc = {k: v for k, v in alias_labels.items() if "monitor" not in k}
     dataset_descriptions = {**default_desc, **(dataset_descriptions or {})}
 
-    results = pd.concat([_load_results(p) for p in db_paths], ignore_index=True)
-    speedtests = pd.concat([_load_speedtests(p) for p in db_paths], ignore_index=True)
+    # Each DB is read on its own connection; SQLite and the Arrow fetch release the GIL while reading.
+    with ThreadPoolExecutor(max_workers=min(8, len(db_paths))) as pool:
+        loaded = list(pool.map(_load_db, db_paths))
+    results = pd.concat([r for r, _ in loaded], ignore_index=True)
+    speedtests = pd.concat([s for _, s in loaded], ignore_index=True)
+
+    # Low-cardinality labels become categoricals after the concat so every DB shares one dictionary.
+    for col in ("dataset", "target_name", "interface", "host"):
+        results[col] = results[col].astype("category")
+    for col in ("dataset", "tool"):
+        speedtests[col] = speedtests[col].astype("category")
 
     unique_datasets = list(results["dataset"].unique())
+    # Sort once here; everything downstream groups with sort=False and relies on time order within groups.
+    results = results.sort_values("ts", kind="stable", ignore_index=True)
+    speedtests = speedtests.sort_values("ts", kind="stable", ignore_index=True)
     dataset_colors = {ds: plt.cm.tab10(i % 10) for i, ds in enumerate(unique_datasets)}
     # Apply alias labels to any dataset names that match known aliases.
     alias_labels_lower = {k.lower(): v for k, v in alias_labels.items()}
@@ -158,111 +363,170 @@ def load_data(
     )
 
 
-def _find_outages(df: pd.DataFrame) -> pd.DataFrame:
-    rows: List[dict] = []
-    for (dataset, target), g in df.sort_values("ts").groupby(["dataset", "target_name"], sort=False):
-        interface = g["interface"].mode().iat[0] if not g["interface"].dropna().empty else None
-        cadence = g["ts"].diff().dt.total_seconds().median() if len(g) > 1 else None
-        in_outage = False
-        start = end = None
-        fail_count = 0
-        for _, row in g.iterrows():
-            if row["success"] == 0:
-                if not in_outage:
-                    start = row["ts"]
-                    in_outage = True
-                    fail_count = 0
-                fail_count += 1
-                end = row["ts"]
-            elif in_outage:
-                rows.append(
-                    {
-                        "dataset": dataset,
-                        "target_name": target,
-                        "interface": interface,
-                        "start_ts": start,
-                        "end_ts": end,
-                        "failed_checks": fail_count,
-                        "cadence_hint_seconds": cadence,
-                        "duration_seconds": (end - start).total_seconds() if end is not None else None,
-                    }
-                )
-                in_outage = False
-        if in_outage:
-            rows.append(
-                {
-                    "dataset": dataset,
-                    "target_name": target,
-                    "interface": interface,
-                    "start_ts": start,
-                    "end_ts": end,
-                    "failed_checks": fail_count,
-                    "cadence_hint_seconds": cadence,
-                    "duration_seconds": (end - start).total_seconds() if end is not None else None,
-                }
-            )
-    return pd.DataFrame(rows)
+def _failure_runs_numpy(fail: np.ndarray, first: np.ndarray, last: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start/end positions of each run of failures; first/last mark group edges that runs cannot cross."""
+    prev_fail = np.concatenate(([False], fail[:-1])) & ~first
+    next_fail = np.concatenate((fail[1:], [False])) & ~last
+    return np.flatnonzero(fail & ~prev_fail), np.flatnonzero(fail & ~next_fail)
+
+
+def _failure_runs_loop(fail: np.ndarray, first: np.ndarray, last: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Single-pass equivalent of _failure_runs_numpy for numba to compile."""
+    n = fail.shape[0]
+    starts = np.empty(n, np.int64)
+    ends = np.empty(n, np.int64)
+    k = 0
+    for i in range(n):
+        if fail[i]:
+            if first[i] or not fail[i - 1]:
+                starts[k] = i
+            if last[i] or not fail[i + 1]:
+                ends[k] = i
+                k += 1
+    return starts[:k], ends[:k]
+
+
+_failure_runs = numba.njit(cache=True)(_failure_runs_loop) if numba is not None else _failure_runs_numpy
+
+
+def _find_outages(df: pd.DataFrame, failure_mask: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """Collapse each run of consecutive failed checks per (dataset, target) into one outage row.
+
+    df must be in time order, as load_data leaves bundle.results; failure_mask may pass in a
+    precomputed success == 0 mask aligned with df.
+    """
+    if df.empty:
+        return pd.DataFrame()
+    # Lay groups out back to back (stable, so each stays in time order) and scan every group in one pass.
+    group_ids = df.groupby(["dataset", "target_name"], sort=False, observed=True).ngroup().to_numpy()
+    order = np.argsort(group_ids, kind="stable")
+    group_ids = group_ids[order]
+    boundary = group_ids[1:] != group_ids[:-1]
+    first = np.concatenate(([True], boundary))
+    last = np.concatenate((boundary, [True]))
+    if failure_mask is None:
+        failure_mask = df["success"].to_numpy() == 0
+    fail = failure_mask[order]
+    starts, ends = _failure_runs(fail, first, last)
+    if not starts.size:
+        return pd.DataFrame()
+
+    ordered = df.iloc[order].reset_index(drop=True)
+    ts = ordered["ts"]
+    gaps = ts.diff().dt.total_seconds().where(~first)
+    cadence = gaps.groupby(group_ids).median()
+    group_pos = np.flatnonzero(first)
+    outage_groups = group_ids[starts]
+    interface = {}
+    for gid in np.unique(outage_groups):
+        lo = group_pos[gid]
+        hi = group_pos[gid + 1] if gid + 1 < group_pos.size else len(ordered)
+        values = ordered["interface"].iloc[lo:hi]
+        interface[gid] = values.mode().iat[0] if not values.dropna().empty else None
+
+    start_ts = ts.iloc[starts].reset_index(drop=True)
+    end_ts = ts.iloc[ends].reset_index(drop=True)
+    return pd.DataFrame(
+        {
+            "dataset": ordered["dataset"].to_numpy()[starts],
+            "target_name": ordered["target_name"].to_numpy()[starts],
+            "interface": [interface[gid] for gid in outage_groups],
+            "start_ts": start_ts,
+            "end_ts": end_ts,
+            "failed_checks": ends - starts + 1,
+            "cadence_hint_seconds": cadence.to_numpy()[outage_groups],
+            "duration_seconds": (end_ts - start_ts).dt.total_seconds(),
+        }
+    )
 
 
 def _find_outages_from_speedtests(df: pd.DataFrame, gap_factor: float = 2.0) -> pd.DataFrame:
     """Infer outages from gaps between successful speedtests."""
-    rows: List[dict] = []
-    for dataset, g in df.sort_values("ts").groupby("dataset", sort=False):
-        g_ok = g[g["success"] == 1].sort_values("ts")
-        if len(g_ok) < 2:
+    frames: List[pd.DataFrame] = []
+    for dataset, g in df.groupby("dataset", sort=False, observed=True):
+        ts = g.loc[g["success"] == 1, "ts"]
+        if len(ts) < 2:
             continue
-        cadence = g_ok["ts"].diff().dt.total_seconds().median()
+        deltas = np.diff(ts.to_numpy("datetime64[ns]").view(np.int64)) / 1e9
+        cadence = np.median(deltas)
         if not cadence or cadence <= 0:
             continue
-        threshold = cadence * gap_factor
-        prev_ts = None
-        for ts in g_ok["ts"]:
-            if prev_ts is not None:
-                delta = (ts - prev_ts).total_seconds()
-                if delta > threshold:
-                    rows.append(
-                        {
-                            "dataset": dataset,
-                            "target_name": None,
-                            "start_ts": prev_ts,
-                            "end_ts": ts,
-                            "duration_seconds": delta,
-                            "failed_checks": None,
-                        }
-                    )
-            prev_ts = ts
-    return pd.DataFrame(rows)
+        gaps = np.flatnonzero(deltas > cadence * gap_factor)
+        if not gaps.size:
+            continue
+        frames.append(
+            pd.DataFrame(
+                {
+                    "dataset": dataset,
+                    "target_name": None,
+                    "start_ts": ts.iloc[gaps].reset_index(drop=True),
+                    "end_ts": ts.iloc[gaps + 1].reset_index(drop=True),
+                    "duration_seconds": deltas[gaps],
+                    "failed_checks": None,
+                }
+            )
+        )
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+_SPEED_COLUMNS = (
+    ("download_mbps", "download", "mbps"),
+    ("upload_mbps", "upload", "mbps"),
+    ("ping_ms", "speed_ping", "ms"),
+)
+
+
+def _plain_keys(df: pd.DataFrame, keys: Sequence[str]) -> pd.DataFrame:
+    # Group keys come back categorical; plain strings merge cleanly across frames with different categories.
+    for key in keys:
+        df[key] = df[key].astype(str)
+    return df
 
 
 def process_data(bundle: DataBundle) -> pd.DataFrame:
-    """Compute summary statistics for ping, outages, and speedtests."""
+    """Compute summary statistics for ping, outages, and speedtests from the bundle's frames."""
     results = bundle.results
     speedtests = bundle.speedtests
 
-    outages = _find_outages(results)
-
-    ping_stats = (
-        results[results["success"] == 1]
-        .groupby(["dataset", "target_name"], as_index=False)
-        .agg(
-            ping_mean_ms=("latency_ms", "mean"),
-            ping_std_ms=("latency_ms", "std"),
-            n_pings=("latency_ms", "count"),
-        )
+    outages = _find_outages(results, bundle.failure_mask)
+
+    # One grouped pass over the results: latency is NaN on failed checks so mean/std/count only see successes.
+    success = bundle.success_mask
+    keys = ["dataset", "target_name"]
+    per_check = pd.DataFrame(
+        {
+            "dataset": results["dataset"],
+            "target_name": results["target_name"],
+            "latency": np.where(success, results["latency_ms"].to_numpy(np.float64), np.nan),
+            "failed": ~success,
+            "ts": results["ts"],
+        }
     )
-    ping_stats["ping_sem_ms"] = ping_stats["ping_std_ms"] / np.sqrt(ping_stats["n_pings"].clip(lower=1))
-
-    failure_rate = (
-        results.assign(is_failure=lambda d: d["success"] == 0)
-        .groupby(["dataset", "target_name"], as_index=False)
-        .agg(failures=("is_failure", "sum"), total_checks=("success", "count"))
+    ping_summary = per_check.groupby(keys, observed=True, as_index=False).agg(
+        ping_mean_ms=("latency", "mean"),
+        ping_std_ms=("latency", "std"),
+        n_pings=("latency", "count"),
+        failures=("failed", "sum"),
+        total_checks=("failed", "size"),
+        first_ts=("ts", "min"),
+        last_ts=("ts", "max"),
     )
-    failure_rate["fail_pct"] = 100 * failure_rate["failures"] / failure_rate["total_checks"].clip(lower=1)
+    _plain_keys(ping_summary, keys)
+    # Targets with no successful checks have no ping statistics at all, rather than a zero count.
+    ping_summary["n_pings"] = ping_summary["n_pings"].mask(ping_summary["n_pings"] == 0)
+    ping_summary["ping_sem_ms"] = ping_summary["ping_std_ms"] / np.sqrt(ping_summary["n_pings"].clip(lower=1))
+    ping_summary["fail_pct"] = 100 * ping_summary["failures"] / ping_summary["total_checks"].clip(lower=1)
+    span_seconds = (ping_summary["last_ts"] - ping_summary["first_ts"]).dt.total_seconds()
+    ping_summary = ping_summary[
+        ["dataset", "target_name", "ping_mean_ms", "ping_std_ms", "n_pings", "ping_sem_ms", "failures", "total_checks", "fail_pct"]
+    ]
 
     if not outages.empty:
         outages["duration_seconds"] = outages["duration_seconds"].fillna(0)
         outage_summary = (
-            outages.groupby(["dataset", "target_name"], as_index=False)
+            outages.groupby(keys, as_index=False)
             .agg(
                 outage_events=("start_ts", "count"),
                 outage_seconds=("duration_seconds", "sum"),
@@ -270,41 +534,31 @@ def process_data(bundle: DataBundle) -> pd.DataFrame:
                 outage_last_ts=("end_ts", "max"),
             )
         )
+        _plain_keys(outage_summary, keys)
     else:
         outage_summary = pd.DataFrame(
             columns=["dataset", "target_name", "outage_events", "outage_seconds", "outage_first_ts", "outage_last_ts"]
         )
 
-    span_info = results.groupby(["dataset", "target_name"], as_index=False).agg(first_ts=("ts", "min"), last_ts=("ts", "max"))
-    span_info["span_seconds"] = (span_info["last_ts"] - span_info["first_ts"]).dt.total_seconds()
-
-    summary = ping_stats.merge(failure_rate, on=["dataset", "target_name"], how="outer")
-    summary = summary.merge(outage_summary, on=["dataset", "target_name"], how="left")
-    summary = summary.merge(span_info[["dataset", "target_name", "span_seconds"]], on=["dataset", "target_name"], how="left")
+    summary = ping_summary.merge(outage_summary, on=keys, how="left")
+    summary["span_seconds"] = span_seconds
     summary["outage_minutes"] = summary["outage_seconds"].fillna(0) / 60
     summary["outage_pct_est"] = 100 * summary["outage_seconds"].fillna(0) / summary["span_seconds"].replace({0: np.nan})
 
     speed_ok = speedtests[speedtests["success"] == 1]
-    speed_stats = (
-        speed_ok.groupby("dataset", as_index=False)
-        .agg(
-            download_mean_mbps=("download_mbps", "mean"),
-            download_std_mbps=("download_mbps", "std"),
-            download_n=("download_mbps", "count"),
-            upload_mean_mbps=("upload_mbps", "mean"),
-            upload_std_mbps=("upload_mbps", "std"),
-            upload_n=("upload_mbps", "count"),
-            speed_ping_mean_ms=("ping_ms", "mean"),
-            speed_ping_std_ms=("ping_ms", "std"),
-            speed_ping_n=("ping_ms", "count"),
-        )
+    speed_values = pd.DataFrame(
+        {"dataset": speed_ok["dataset"], **{col: speed_ok[col].to_numpy(np.float64) for col, _, _ in _SPEED_COLUMNS}}
+    )
+    speed_stats = speed_values.groupby("dataset", observed=True, as_index=False).agg(
+        **{
+            f"{name}_{stat}_{unit}" if stat != "n" else f"{name}_n": (col, func)
+            for col, name, unit in _SPEED_COLUMNS
+            for stat, func in (("mean", "mean"), ("std", "std"), ("n", "count"))
+        }
     )
-    for col_std, col_n, sem_name in [
-        ("download_std_mbps", "download_n", "download_sem_mbps"),
-        ("upload_std_mbps", "upload_n", "upload_sem_mbps"),
-        ("speed_ping_std_ms", "speed_ping_n", "speed_ping_sem_ms"),
-    ]:
-        speed_stats[sem_name] = speed_stats[col_std] / np.sqrt(speed_stats[col_n].clip(lower=1))
+    _plain_keys(speed_stats, ["dataset"])
+    for _, name, unit in _SPEED_COLUMNS:
+        speed_stats[f"{name}_sem_{unit}"] = speed_stats[f"{name}_std_{unit}"] / np.sqrt(speed_stats[f"{name}_n"].clip(lower=1))
 
     summary = summary.merge(speed_stats, on="dataset", how="left")
     return summary
@@ -333,30 +587,20 @@ def export_data_for_web(
     - failureOrder: dataset order for y-axis labels
     - outages: outages with start/end/duration
     """
-    import json
-    from datetime import datetime
-    
     summary = process_data(bundle)
     
-    # Convert matplotlib colors to hex
-    palette = {}
-    for ds, color in bundle.dataset_colors.items():
-        if isinstance(color, tuple) and len(color) >= 3:
-            # Convert matplotlib RGB (0-1) to hex
-            r, g, b = int(color[0] * 255), int(color[1] * 255), int(color[2] * 255)
-            palette[ds] = f"#{r:02x}{g:02x}{b:02x}"
-        else:
-            palette[ds] = color
-    
-    # Create dataset labels from descriptions
-    dataset_labels = dict(bundle.dataset_descriptions)
+    palette = bundle.palette_hex
+    # Read-only here, so no copy of the descriptions is needed.
+    dataset_labels = bundle.dataset_descriptions
+    label_of = dataset_labels.get
+    color_of = palette.get
     
     # Create dataset spans
     dataset_spans = []
     for ds, (start, end) in bundle.result_spans.items():
         dataset_spans.append({
             "dataset": ds,
-            "label": dataset_labels.get(ds, ds),
+            "label": label_of(ds, ds),
             "start": start.isoformat(),
             "end": end.isoformat(),
         })
@@ -367,27 +611,20 @@ def export_data_for_web(
     
     latency_series = {}
     for target in targets:
-        subset = bundle.results[bundle.results["target_name"] == target].sort_values("ts")
+        subset = bundle.results[bundle.results["target_name"] == target]
         series = []
-        for ds, g in subset.groupby("dataset", sort=False):
-            g_sorted = g.sort_values("ts")
-            cadence = g_sorted["ts"].diff().dt.total_seconds().median()
-            data_points = []
-            for _, row in g_sorted.iterrows():
-                # Use null for failures to break the line
-                y_value = _round_sigfigs(row["latency_ms"]) if row["success"] == 1 else None
-                data_points.append(
-                    {
-                        "x": row["ts"].isoformat(),
-                        "y": y_value,
-                    }
-                )
-            data_points = _add_gap_breaks(data_points, gap_threshold_seconds=cadence * 3 if cadence else None)
+        for ds, g in subset.groupby("dataset", sort=False, observed=True):
+            cadence = g["ts"].diff().dt.total_seconds().median()
+            ts = g["ts"].to_numpy("datetime64[ns]")
+            # Use null for failures to break the line
+            y = g["latency_ms"].where(g["success"] == 1).to_numpy(np.float64)
+            ts, y = _add_gap_breaks(ts, y, gap_threshold_seconds=cadence * 3 if cadence else None)
+            data_points = _points(ts, y)
             series.append({
-                "label": dataset_labels.get(ds, ds),
+                "label": label_of(ds, ds),
                 "dataset": ds,
-                "borderColor": palette.get(ds, "#60a5fa"),
-                "backgroundColor": palette.get(ds, "#60a5fa"),
+                "borderColor": color_of(ds, "#60a5fa"),
+                "backgroundColor": color_of(ds, "#60a5fa"),
                 "data": data_points,
             })
         latency_series[target] = series
@@ -395,85 +632,75 @@ def export_data_for_web(
     # Build failures series (scatter) and order for y ticks
     failure_order = list(bundle.dataset_colors.keys())
     failure_series = []
-    failed = bundle.results[bundle.results["success"] == 0].sort_values("ts")
+    failed = bundle.failed_results
     for ds_idx, ds in enumerate(failure_order):
-        g = failed[failed["dataset"] == ds].sort_values("ts")
+        g = failed[failed["dataset"] == ds]
         if g.empty:
             continue
-        data_points = [{"x": row["ts"].isoformat(), "y": ds_idx} for _, row in g.iterrows()]
+        data_points = [{"x": x, "y": ds_idx} for x in _iso_utc(g["ts"].to_numpy("datetime64[ns]")).tolist()]
         failure_series.append(
             {
-                "label": dataset_labels.get(ds, ds),
+                "label": label_of(ds, ds),
                 "dataset": ds,
-                "borderColor": palette.get(ds, "#60a5fa"),
-                "backgroundColor": palette.get(ds, "#60a5fa"),
+                "borderColor": color_of(ds, "#60a5fa"),
+                "backgroundColor": color_of(ds, "#60a5fa"),
                 "data": data_points,
             }
         )
     
     # Build speedtest series
     speedtest_series = []
-    subset = bundle.speedtests.sort_values("ts")
-    for ds, g in subset.groupby("dataset", sort=False):
-        g_sorted = g.sort_values("ts")
-        cadence = g_sorted["ts"].diff().dt.total_seconds().median()
-        # Download series
-        download_data = []
-        upload_data = []
-        for _, row in g_sorted.iterrows():
-            if row["success"] == 1:
-                ts_iso = row["ts"].isoformat()
-                download_data.append({"x": ts_iso, "y": _round_sigfigs(row["download_mbps"])})
-                upload_data.append({"x": ts_iso, "y": _round_sigfigs(row["upload_mbps"])})
-        download_data = _add_gap_breaks(download_data, gap_threshold_seconds=cadence * 3 if cadence else None)
-        upload_data = _add_gap_breaks(upload_data, gap_threshold_seconds=cadence * 3 if cadence else None)
+    for ds, g in bundle.speedtests.groupby("dataset", sort=False, observed=True):
+        cadence = g["ts"].diff().dt.total_seconds().median()
+        ok = g[g["success"] == 1]
+        ts = ok["ts"].to_numpy("datetime64[ns]")
+        threshold = cadence * 3 if cadence else None
+        download_data = _points(*_add_gap_breaks(ts, ok["download_mbps"].to_numpy(np.float64), threshold))
+        upload_data = _points(*_add_gap_breaks(ts, ok["upload_mbps"].to_numpy(np.float64), threshold))
         if download_data:
             speedtest_series.append({
-                "label": f"{dataset_labels.get(ds, ds)} - Download",
+                "label": f"{label_of(ds, ds)} - Download",
                 "dataset": ds,
-                "borderColor": palette.get(ds, "#60a5fa"),
-                "backgroundColor": palette.get(ds, "#60a5fa"),
+                "borderColor": color_of(ds, "#60a5fa"),
+                "backgroundColor": color_of(ds, "#60a5fa"),
                 "data": download_data,
             })
         if upload_data:
             speedtest_series.append({
-                "label": f"{dataset_labels.get(ds, ds)} - Upload",
+                "label": f"{label_of(ds, ds)} - Upload",
                 "dataset": ds,
-                "borderColor": palette.get(ds, "#60a5fa"),
-                "backgroundColor": palette.get(ds, "#60a5fa"),
+                "borderColor": color_of(ds, "#60a5fa"),
+                "backgroundColor": color_of(ds, "#60a5fa"),
                 "borderDash": [6, 4],
                 "data": upload_data,
             })
     
     # Convert summary to dict format
-    summary_dict = summary.to_dict("records")
-    # Convert any datetime/timedelta objects to strings
-    for row in summary_dict:
-        for key, value in row.items():
-            if pd.isna(value):
-                row[key] = None
-            elif isinstance(value, (pd.Timestamp, datetime)):
-                row[key] = value.isoformat()
-            elif isinstance(value, pd.Timedelta):
-                row[key] = _round_sigfigs(value.total_seconds())
-            elif isinstance(value, (np.integer, np.floating)):
-                row[key] = _round_sigfigs(float(value))
+    summary_dict = _summary_records(summary)
 
     # Serialize outages (from speedtest gaps)
-    outages_records = []
     outages = _find_outages_from_speedtests(bundle.speedtests)
-    for _, row in outages.iterrows():
-        outages_records.append(
+    outages_records = []
+    if not outages.empty:
+        # Convert whole columns, then zip them into records; missing values become null.
+        starts = _iso_or_none(outages["start_ts"])
+        ends = _iso_or_none(outages["end_ts"])
+        durations = [None if pd.isna(v) else float(v) for v in outages["duration_seconds"]]
+        failed_checks = [None if pd.isna(v) else int(v) for v in outages["failed_checks"]]
+        outages_records = [
             {
-                "dataset": row.get("dataset"),
-                "target_name": row.get("target_name"),
-                "start_ts": row.get("start_ts").isoformat() if pd.notna(row.get("start_ts")) else None,
-                "end_ts": row.get("end_ts").isoformat() if pd.notna(row.get("end_ts")) else None,
-                "duration_seconds": float(row.get("duration_seconds")) if pd.notna(row.get("duration_seconds")) else None,
-                "failed_checks": int(row.get("failed_checks")) if pd.notna(row.get("failed_checks")) else None,
+                "dataset": dataset,
+                "target_name": target_name,
+                "start_ts": start_ts,
+                "end_ts": end_ts,
+                "duration_seconds": duration,
+                "failed_checks": failed,
             }
-        )
-    
+            for dataset, target_name, start_ts, end_ts, duration, failed in zip(
+                outages["dataset"], outages["target_name"], starts, ends, durations, failed_checks
+            )
+        ]
+
     result = {
         "palette": palette,
         "datasetLabels": dataset_labels,
@@ -488,8 +715,9 @@ def export_data_for_web(
     }
     
     if output_path:
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2, default=str)
+        # Stream one series at a time: each is a single orjson call, and none holds the full document.
+        with open(output_path, "wb") as f:
+            dump(result, f, depth=3, default=str)
     
     return result
 
@@ -536,15 +764,14 @@ def display_data_plot(
 
     # Latency for requested targets.
     for ax, target in zip(axes[: len(targets)], targets):
-        subset = bundle.results[bundle.results["target_name"] == target].sort_values("ts")
+        subset = bundle.results[bundle.results["target_name"] == target]
         _shade_spans(ax, bundle.result_spans, bundle.dataset_colors)
-        for ds, g in subset.groupby("dataset", sort=False):
+        for ds, g in subset.groupby("dataset", sort=False, observed=True):
             color = bundle.dataset_colors.get(ds, None)
-            g_sorted = g.sort_values("ts")
             # Insert NaNs for failures so lines break across dead space.
-            y = g_sorted["latency_ms"].where(g_sorted["success"] == 1)
-            ax.plot(g_sorted["ts"], y, label=f"{ds} {target}", color=color)
-            fails = g_sorted[g_sorted["success"] == 0]
+            y = g["latency_ms"].where(g["success"] == 1)
+            ax.plot(g["ts"], y, label=f"{ds} {target}", color=color)
+            fails = g[g["success"] == 0]
             if not fails.empty:
                 ax.scatter(fails["ts"], [-5] * len(fails), color=color, marker="x", s=25, label=f"{ds} fail")
         ax.set_ylabel(f"{target} ms")
@@ -557,9 +784,9 @@ def display_data_plot(
     # Failures across all targets.
     ax_fail = axes[len(targets)]
     _shade_spans(ax_fail, bundle.result_spans, bundle.dataset_colors)
-    failed = bundle.results[bundle.results["success"] == 0].sort_values("ts")
+    failed = bundle.failed_results
     if not failed.empty:
-        for idx, (ds, g) in enumerate(failed.groupby("dataset", sort=False)):
+        for idx, (ds, g) in enumerate(failed.groupby("dataset", sort=False, observed=True)):
             color = bundle.dataset_colors.get(ds, None)
             ax_fail.scatter(g["ts"], [idx] * len(g), color=color, marker="x", s=25, label=ds)
         ax_fail.set_yticks(range(len(failed["dataset"].unique())))
@@ -572,8 +799,7 @@ def display_data_plot(
     if include_speedtests:
         ax_speed = axes[-1]
         _shade_spans(ax_speed, bundle.speedtest_spans, bundle.dataset_colors)
-        subset = bundle.speedtests.sort_values("ts")
-        for ds, g in subset.groupby("dataset", sort=False):
+        for ds, g in bundle.speedtests.groupby("dataset", sort=False, observed=True):
             color = bundle.dataset_colors.get(ds, None)
             ax_speed.plot(g["ts"], g["download_mbps"], label=f"{ds} down", color=color, linestyle="-")
             ax_speed.plot(g["ts"], g["upload_mbps"], label=f"{ds} up", color=color, linestyle="--")
@@ -1,13 +1,30 @@
 from __future__ import annotations
 
+import asyncio
+import errno
+import os
 import re
+import socket
+import struct
 import subprocess
 import sys
+import time
 from datetime import datetime, timezone
-from typing import Optional
+from typing import List, Optional
 
 from netmon.models import PingResult, Target
 
+# Matches "time=12.3 ms" (Linux/macOS) and "time<1ms" / "time=12ms" (Windows).
+_search_latency = re.compile(r"time[=<]([0-9.]+)\s*ms").search
+
+# ICMP protocol and (echo request, echo reply) types per address family.
+_ICMP_PROTO = {socket.AF_INET: socket.IPPROTO_ICMP, socket.AF_INET6: socket.IPPROTO_ICMPV6}
+_ICMP_ECHO_TYPES = {socket.AF_INET: (8, 0), socket.AF_INET6: (128, 129)}
+_ICMP_HEADER = struct.Struct("!BBHHH")
+_SO_BINDTODEVICE = getattr(socket, "SO_BINDTODEVICE", None)
+# socket() errors meaning unprivileged ICMP sockets will never work here, as opposed to transient failures.
+_ICMP_UNAVAILABLE_ERRNOS = {errno.EPERM, errno.EACCES, errno.EPROTONOSUPPORT}
+
 
 class Pinger:
     def __init__(self, timeout: float) -> None:
@@ -15,6 +32,14 @@ class Pinger:
 
     def ping(self, target: Target) -> PingResult:
         result = self._run_ping(target.host, target.interface)
+        return self._to_result(target, result)
+
+    async def ping_async(self, target: Target) -> PingResult:
+        """Like ping(), but awaits the ping process on the event loop instead of blocking a thread."""
+        result = await self._run_ping_async(target.host, target.interface)
+        return self._to_result(target, result)
+
+    def _to_result(self, target: Target, result: dict) -> PingResult:
         return PingResult(
             ts_utc=datetime.now(timezone.utc),
             target_name=target.name,
@@ -25,7 +50,7 @@ class Pinger:
             error=result["error"],
         )
 
-    def _run_ping(self, host: str, interface: Optional[str]) -> dict:
+    def _build_command(self, host: str, interface: Optional[str]) -> List[str]:
         system = sys.platform
         cmd = ["ping"]
 
@@ -38,6 +63,10 @@ class Pinger:
                 cmd += ["-I", interface]
 
         cmd.append(host)
+        return cmd
+
+    def _run_ping(self, host: str, interface: Optional[str]) -> dict:
+        cmd = self._build_command(host, interface)
 
         try:
             completed = subprocess.run(
@@ -53,17 +82,138 @@ class Pinger:
             return {"success": False, "latency_ms": None, "error": "ping command not found"}
 
         output = (completed.stdout or "") + (completed.stderr or "")
-        success = completed.returncode == 0
+        return self._interpret(completed.returncode, output)
+
+    async def _run_ping_async(self, host: str, interface: Optional[str]) -> dict:
+        cmd = self._build_command(host, interface)
+
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except FileNotFoundError:
+            return {"success": False, "latency_ms": None, "error": "ping command not found"}
+
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=self.timeout + 1)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return {"success": False, "latency_ms": None, "error": "ping timed out"}
+
+        output = stdout.decode(errors="replace") + stderr.decode(errors="replace")
+        return self._interpret(proc.returncode, output)
+
+    def _interpret(self, returncode: int, output: str) -> dict:
+        success = returncode == 0
         latency = self._parse_latency(output) if success else None
-        error = None if success else (output.strip() or f"ping failed with code {completed.returncode}")
+        error = None if success else (output.strip() or f"ping failed with code {returncode}")
 
         return {"success": success, "latency_ms": latency, "error": error}
 
     def _parse_latency(self, output: str) -> Optional[float]:
-        match = re.search(r"time[=<]([0-9.]+)\s*ms", output)
+        match = _search_latency(output)
         if not match:
             return None
         try:
             return float(match.group(1))
         except ValueError:
             return None
+
+
+def _icmp_checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+class AsyncPinger(Pinger):
+    """Pinger whose ping_async sends the ICMP echo itself instead of spawning a ping process.
+
+    Uses unprivileged ICMP datagram sockets (Linux within net.ipv4.ping_group_range, macOS). Where the OS
+    refuses them (e.g. Windows) or an interface cannot be bound, it falls back to the ping command.
+    """
+
+    def __init__(self, timeout: float) -> None:
+        super().__init__(timeout)
+        self._use_icmp = True
+        self._seq = 0
+
+    async def _run_ping_async(self, host: str, interface: Optional[str]) -> dict:
+        if not self._use_icmp:
+            return await super()._run_ping_async(host, interface)
+
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await loop.getaddrinfo(host, None, type=socket.SOCK_DGRAM)
+        except (OSError, UnicodeError) as exc:  # gaierror, or the idna codec rejecting a malformed name
+            return {"success": False, "latency_ms": None, "error": f"cannot resolve {host}: {exc}"}
+        family, _, _, _, sockaddr = infos[0]
+        if family not in _ICMP_PROTO:
+            return await super()._run_ping_async(host, interface)
+
+        try:
+            sock = socket.socket(family, socket.SOCK_DGRAM, _ICMP_PROTO[family])
+        except OSError as exc:
+            if exc.errno in _ICMP_UNAVAILABLE_ERRNOS:
+                # Not permitted/supported on this system; stop trying for the rest of the run.
+                self._use_icmp = False
+            # Anything else (EMFILE, ENOBUFS, ...) may be transient: fall back for this probe only.
+            return await super()._run_ping_async(host, interface)
+        with sock:
+            sock.setblocking(False)
+            if interface:
+                try:
+                    if _SO_BINDTODEVICE is None:
+                        raise OSError("SO_BINDTODEVICE unavailable")
+                    sock.setsockopt(socket.SOL_SOCKET, _SO_BINDTODEVICE, interface.encode())
+                except OSError:
+                    return await super()._run_ping_async(host, interface)
+            return await self._echo(loop, sock, family, sockaddr)
+
+    async def _echo(self, loop: asyncio.AbstractEventLoop, sock: socket.socket, family: int, sockaddr: tuple) -> dict:
+        self._seq = (self._seq + 1) & 0xFFFF
+        seq = self._seq
+        request_type, reply_type = _ICMP_ECHO_TYPES[family]
+        # Linux replaces the identifier with the socket's own and fills in the checksum; macOS needs it.
+        ident = os.getpid() & 0xFFFF
+        payload = b"netmon-ping"
+        checksum = _icmp_checksum(_ICMP_HEADER.pack(request_type, 0, 0, ident, seq) + payload)
+        packet = _ICMP_HEADER.pack(request_type, 0, checksum, ident, seq) + payload
+
+        reply: asyncio.Future = loop.create_future()
+
+        def on_readable() -> None:
+            try:
+                data = sock.recv(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as exc:
+                if not reply.done():
+                    reply.set_exception(exc)
+                return
+            if family == socket.AF_INET and data and data[0] >> 4 == 4:
+                data = data[(data[0] & 0x0F) * 4 :]  # macOS hands back the IPv4 header too
+            if len(data) < _ICMP_HEADER.size or reply.done():
+                return
+            r_type, _, _, _, r_seq = _ICMP_HEADER.unpack_from(data)
+            if r_type == reply_type and r_seq == seq:
+                reply.set_result(time.perf_counter())
+
+        loop.add_reader(sock.fileno(), on_readable)
+        try:
+            sent_at = time.perf_counter()
+            sock.sendto(packet, sockaddr)
+            received_at = await asyncio.wait_for(reply, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            return {"success": False, "latency_ms": None, "error": "ping timed out"}
+        except OSError as exc:
+            return {"success": False, "latency_ms": None, "error": f"ping failed: {exc}"}
+        finally:
+            loop.remove_reader(sock.fileno())
+        return {"success": True, "latency_ms": round((received_at - sent_at) * 1000, 3), "error": None}
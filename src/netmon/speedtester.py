@@ -1,78 +1,187 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import os
+import re
 import shutil
 import subprocess
+import time
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Tuple
+from types import MappingProxyType
+from typing import Any, Callable, List, Mapping, Optional, Tuple
 
+from netmon._json import dumps, loads
 from netmon.models import SpeedtestResult
 
+# Where the official Ookla binary usually lives, checked before falling back to PATH.
+_PREFERRED_SPEEDTEST = ("/usr/bin/speedtest", "/usr/local/bin/speedtest", "/opt/homebrew/bin/speedtest")
+# First server id in `speedtest-cli --list` output; lines look like "12345) Some ISP (City, CC) [x.xx km]".
+_SERVER_ID_RE = re.compile(rb"^\s*(\d+)\)", re.M)
+# A JSON report starts with "{" after optional whitespace.
+_match_object_start = re.compile(rb"\s*\{").match
+# Fixed arguments and server option per tool, keyed like SpeedtestResult.tool.
+_COMMAND_TEMPLATES = {
+    "speedtest": (("--accept-license", "--accept-gdpr", "-f", "json"), "--server-id"),
+    "speedtest-cli": (("--json", "--secure"), "--server"),
+}
+# Stand-in for a missing/null section of Ookla's report; read-only so it can be shared.
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+# Divisors from each CLI's bandwidth unit to Mbps. Dividing by an exact integer keeps results correctly
+# rounded (x / 125_000 == x * 8 / 1_000_000 bit for bit); multiplying by 8e-6 would not.
+_OOKLA_BYTES_PER_MBIT = 125_000
+_CLI_BITS_PER_MBIT = 1_000_000
+# Auto-picked servers are reused across processes for this long before `--list` is consulted again.
+_SERVER_CACHE_TTL_SECONDS = 24 * 3600
+
+
+# (download_mbps, upload_mbps, ping_ms) read from a CLI report; all None when it cannot be parsed.
+Speeds = Tuple[Optional[float], Optional[float], Optional[float]]
+
+
+def _server_cache_path() -> Path:
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "netmon" / "resolved_server.json"
+
+
+@lru_cache(maxsize=8)
+def _cached_which(exe: str) -> Optional[str]:
+    """
+    Like shutil.which but also tries the common user install bin path.
+    Memoized per process; SpeedTester clears it whenever it has to rediscover the CLI.
+    """
+    path = shutil.which(exe)
+    if path:
+        return path
+    user_path = Path.home() / ".local" / "bin" / exe
+    if user_path.exists():
+        return str(user_path)
+    return None
+
+
+def _load_report(output: bytes) -> Optional[dict]:
+    # Both CLIs report a JSON object; warnings or an empty stdout are turned away without running the decoder.
+    if _match_object_start(output) is None:
+        return None
+    try:
+        return loads(output)
+    except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError both subclass ValueError
+        return None
+
+
+@lru_cache(maxsize=4)
+def _detect_variant_cached(exe: str) -> str:
+    """Tell Ookla's binary from the Python speedtest-cli by their `--version` banner; probed once per path."""
+    try:
+        # --version is answered locally, so a short timeout is plenty.
+        completed = subprocess.run(
+            [exe, "--version"], stdin=subprocess.DEVNULL, capture_output=True, timeout=2, check=False
+        )
+    except Exception:
+        return "unknown"
+    for banner in (completed.stdout, completed.stderr):
+        if b"Ookla" in banner or b"ookla" in banner:
+            return "ookla"
+    for banner in (completed.stdout, completed.stderr):
+        if b"speedtest-cli" in banner:
+            return "python"
+    return "unknown"
+
 
 class SpeedTester:
     def __init__(self, timeout: float, server_id: Optional[str] = None) -> None:
         self.timeout = timeout
         self.server_id = server_id
         self._auto_server_resolved: Optional[str] = None
+        # (tool, variant, exe) from the first successful discovery; redone only if exe disappears.
+        self._resolved_cmd_cache: Optional[Tuple[str, Optional[str], str]] = None
+        # argv prefix, server option and report parser for the cached tool, filled in alongside the cache.
+        self._base_cmd: List[str] = []
+        self._server_flag = ""
+        self._parse_fn: Callable[[bytes], Speeds] = self._parse_cli
 
     def run(self) -> SpeedtestResult:
         picked = self._pick_command()
         ts = datetime.now(timezone.utc)
         if not picked:
-            return SpeedtestResult(
-                ts_utc=ts,
-                tool=None,
-                success=False,
-                download_mbps=None,
-                upload_mbps=None,
-                ping_ms=None,
-                error="No speedtest CLI found (install Ookla speedtest or speedtest-cli)",
-            )
+            return self._failed(ts, None, "No speedtest CLI found (install Ookla speedtest or speedtest-cli)")
         tool, cmd = picked
 
+        # ts_utc marks when the test started; the run time itself comes from the monotonic clock.
+        started = time.monotonic()
         try:
+            # Kept as bytes: the JSON parser takes them directly and only error text is ever decoded.
+            # stdin is /dev/null so a CLI stopping at a prompt (e.g. a license question) reads EOF instead of hanging.
+            # No preexec_fn or user/group/extra_groups switches: those force a plain fork(), while this keeps CPython
+            # on its vfork/posix_spawn path, so launching the CLI never copies the monitor's page tables.
             completed = subprocess.run(
                 cmd,
+                stdin=subprocess.DEVNULL,
                 capture_output=True,
-                text=True,
                 timeout=self.timeout,
                 check=False,
             )
         except subprocess.TimeoutExpired:
-            return SpeedtestResult(
-                ts_utc=ts,
-                tool=tool,
-                success=False,
-                download_mbps=None,
-                upload_mbps=None,
-                ping_ms=None,
-                error="speedtest timed out",
-            )
+            return self._failed(ts, tool, "speedtest timed out", time.monotonic() - started)
+        return self._to_result(
+            ts, tool, completed.returncode, completed.stdout, completed.stderr, time.monotonic() - started
+        )
+
+    async def run_async(self) -> SpeedtestResult:
+        """Like run(), but awaits the CLI on the event loop instead of blocking a thread for the whole test."""
+        loop = asyncio.get_running_loop()
+        # Discovery may still spawn `--version` / `--list` synchronously; keep that off the loop.
+        picked = await loop.run_in_executor(None, self._pick_command)
+        ts = datetime.now(timezone.utc)
+        if not picked:
+            return self._failed(ts, None, "No speedtest CLI found (install Ookla speedtest or speedtest-cli)")
+        tool, cmd = picked
 
-        output = (completed.stdout or "") + (completed.stderr or "")
-        if completed.returncode != 0:
-            return SpeedtestResult(
-                ts_utc=ts,
-                tool=tool,
-                success=False,
-                download_mbps=None,
-                upload_mbps=None,
-                ping_ms=None,
-                error=output.strip() or f"speedtest failed with code {completed.returncode}",
+        started = time.monotonic()
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            return self._failed(ts, tool, "speedtest timed out", time.monotonic() - started)
+        finally:
+            # Also reached when the awaiting task is cancelled (Ctrl+C): never leave the CLI running.
+            if proc.returncode is None:
+                try:
+                    proc.kill()
+                except ProcessLookupError:
+                    pass  # Exited but not reaped yet.
+                await proc.wait()
+        return self._to_result(ts, tool, proc.returncode, stdout, stderr, time.monotonic() - started)
+
+    def _to_result(
+        self, ts: datetime, tool: str, returncode: int, stdout: bytes, stderr: bytes, duration_s: float
+    ) -> SpeedtestResult:
+        if returncode != 0:
+            output = stdout + stderr
+            return self._failed(
+                ts,
+                tool,
+                output.decode(errors="replace").strip() or f"speedtest failed with code {returncode}",
+                duration_s,
             )
 
-        download_mbps, upload_mbps, ping_ms = self._parse_output(tool, output)
+        # The JSON report goes to stdout; stderr only carries progress/warnings unless stdout is empty.
+        download_mbps, upload_mbps, ping_ms = self._parse_fn(stdout)
+        if download_mbps is None and stderr:
+            download_mbps, upload_mbps, ping_ms = self._parse_fn(stderr)
         if download_mbps is None or upload_mbps is None or ping_ms is None:
-            return SpeedtestResult(
-                ts_utc=ts,
-                tool=tool,
-                success=False,
-                download_mbps=None,
-                upload_mbps=None,
-                ping_ms=None,
-                error="Could not parse speedtest output; raw: "
-                + (output[:4000].strip().replace("\n", " ") or "empty"),
+            output = stdout + stderr
+            return self._failed(
+                ts,
+                tool,
+                "Could not parse speedtest output; raw: "
+                + (output[:4000].decode(errors="replace").strip().replace("\n", " ") or "empty"),
+                duration_s,
             )
 
         return SpeedtestResult(
@@ -83,33 +192,61 @@ class SpeedTester:
             upload_mbps=upload_mbps,
             ping_ms=ping_ms,
             error=None,
+            duration_s=duration_s,
+        )
+
+    def _failed(
+        self, ts: datetime, tool: Optional[str], error: str, duration_s: Optional[float] = None
+    ) -> SpeedtestResult:
+        return SpeedtestResult(
+            ts_utc=ts,
+            tool=tool,
+            success=False,
+            download_mbps=None,
+            upload_mbps=None,
+            ping_ms=None,
+            error=error,
+            duration_s=duration_s,
         )
 
     def _pick_command(self) -> Optional[Tuple[str, list]]:
-        speedtest_path = self._find_speedtest()
-        variant = self._detect_variant(speedtest_path) if speedtest_path else None
+        resolved = self._resolved_cmd_cache
+        if resolved is None or not os.path.exists(resolved[2]):
+            # A vanished binary or an earlier miss (None is cached too) must not stick: look again from scratch.
+            _cached_which.cache_clear()
+            _detect_variant_cached.cache_clear()
+            resolved = self._resolved_cmd_cache = self._discover_command()
+            if resolved is not None:
+                args, self._server_flag = _COMMAND_TEMPLATES[resolved[0]]
+                self._base_cmd = [resolved[2], *args]
+                self._parse_fn = self._parse_ookla if resolved[0] == "speedtest" else self._parse_cli
+        if resolved is None:
+            return None
+        tool, variant, exe = resolved
+
         # Resolve a server automatically for the Python CLI variants if none specified.
         resolved_server = self.server_id or self._auto_server_resolved
-        cli_path = self._which("speedtest-cli")
-        if not resolved_server and (variant == "python" or (not variant and cli_path)):
-            resolved_server = self._resolve_python_cli_server(speedtest_path or cli_path)
+        if not resolved_server and variant in ("python", None):
+            resolved_server = self._resolve_python_cli_server(exe)
             self._auto_server_resolved = resolved_server
 
+        # Only the server flag varies per call, since the server may be resolved later; always hand out a copy.
+        if resolved_server:
+            return (tool, self._base_cmd + [self._server_flag, str(resolved_server)])
+        return (tool, list(self._base_cmd))
+
+    def _discover_command(self) -> Optional[Tuple[str, Optional[str], str]]:
+        """Find the CLI to use as (tool, variant, exe); spawns `--version` so it is only run on a cache miss."""
+        speedtest_path = self._find_speedtest()
+        variant = self._detect_variant(speedtest_path) if speedtest_path else None
         if variant == "ookla":
-            cmd = [speedtest_path, "--accept-license", "--accept-gdpr", "-f", "json"]
-            if resolved_server:
-                cmd += ["--server-id", str(resolved_server)]
-            return ("speedtest", cmd)
+            return ("speedtest", variant, speedtest_path)
         if variant == "python":
-            cmd = [speedtest_path, "--json", "--secure"]
-            if resolved_server:
-                cmd += ["--server", str(resolved_server)]
-            return ("speedtest-cli", cmd)
+            return ("speedtest-cli", variant, speedtest_path)
+        # Only walk PATH for speedtest-cli when `speedtest` is missing or not a recognised variant.
+        cli_path = self._which("speedtest-cli")
         if cli_path:
-            cmd = [cli_path, "--json", "--secure"]
-            if resolved_server:
-                cmd += ["--server", str(resolved_server)]
-            return ("speedtest-cli", cmd)
+            return ("speedtest-cli", variant, cli_path)
         return None
 
     def _find_speedtest(self) -> Optional[str]:
@@ -117,93 +254,78 @@ class SpeedTester:
         Prefer the official Ookla binary if present (e.g., /usr/bin/speedtest),
         falling back to PATH discovery.
         """
-        preferred = [
-            Path("/usr/bin/speedtest"),
-            Path("/usr/local/bin/speedtest"),
-            Path("/opt/homebrew/bin/speedtest"),
-        ]
-        for candidate in preferred:
-            if candidate.exists():
-                return str(candidate)
+        for candidate in _PREFERRED_SPEEDTEST:
+            # One access() call checks both presence and that the file can actually be run.
+            if os.access(candidate, os.X_OK):
+                return candidate
         return self._which("speedtest")
 
     def _which(self, exe: str) -> Optional[str]:
-        """
-        Like shutil.which but also tries the common user install bin path.
-        """
-        path = shutil.which(exe)
-        if path:
-            return path
-        user_path = Path.home() / ".local" / "bin" / exe
-        if user_path.exists():
-            return str(user_path)
-        return None
+        return _cached_which(exe)
 
     def _detect_variant(self, exe: str) -> str:
-        try:
-            completed = subprocess.run(
-                [exe, "--version"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                check=False,
-            )
-            text = ((completed.stdout or "") + (completed.stderr or "")).lower()
-        except Exception:
-            return "unknown"
-        if "ookla" in text:
-            return "ookla"
-        if "speedtest-cli" in text:
-            return "python"
-        return "unknown"
+        return _detect_variant_cached(exe)
 
     def _resolve_python_cli_server(self, exe: Optional[str]) -> Optional[str]:
         """
         Try to pick the first server from speedtest-cli --list (which is sorted by distance).
-        This is a lightweight best-effort to avoid manual configuration.
+        This is a lightweight best-effort to avoid manual configuration; the pick is cached on disk
+        (under $XDG_CACHE_HOME/netmon) for a day so restarts skip the slow list download.
         """
+        cache_path = _server_cache_path()
+        try:
+            cached = loads(cache_path.read_bytes())
+            if time.time() - cached["ts"] < _SERVER_CACHE_TTL_SECONDS and cached["server_id"]:
+                return str(cached["server_id"])
+        except (OSError, ValueError, TypeError, KeyError):
+            pass  # missing, unreadable or stale-format cache: ask the CLI
+
+        server_id = self._list_first_server(exe)
+        if server_id:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                cache_path.write_bytes(dumps({"server_id": server_id, "ts": time.time()}))
+            except OSError:
+                pass  # caching is best-effort
+        return server_id
+
+    def _list_first_server(self, exe: Optional[str]) -> Optional[str]:
         if not exe:
             exe = self._which("speedtest-cli") or self._which("speedtest") or "speedtest-cli"
         try:
             completed = subprocess.run(
                 [exe, "--secure", "--list"],
+                stdin=subprocess.DEVNULL,
                 capture_output=True,
-                text=True,
                 timeout=min(self.timeout, 15),
                 check=False,
             )
         except Exception:
             return None
 
-        lines = (completed.stdout or "").splitlines()
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            # Lines look like: "12345) Some ISP (City, CC) [x.xx km]"
-            if line[0].isdigit():
-                server_id = line.split(")")[0].split()[0]
-                return server_id
-        return None
+        match = _SERVER_ID_RE.search(completed.stdout)
+        return match.group(1).decode() if match else None
 
-    def _parse_output(self, tool: str, output: str) -> Tuple[Optional[float], Optional[float], Optional[float]]:
-        try:
-            data = json.loads(output)
-        except json.JSONDecodeError:
+    def _parse_ookla(self, output: bytes) -> Speeds:
+        data = _load_report(output)
+        if data is None:
             return None, None, None
+        # Ookla reports bandwidth in bytes per second
+        download = (data.get("download") or _EMPTY).get("bandwidth")
+        upload = (data.get("upload") or _EMPTY).get("bandwidth")
+        ping = (data.get("ping") or _EMPTY).get("latency")
+        download_mbps = download / _OOKLA_BYTES_PER_MBIT if download is not None else None
+        upload_mbps = upload / _OOKLA_BYTES_PER_MBIT if upload is not None else None
+        return download_mbps, upload_mbps, ping
 
-        if tool == "speedtest":
-            download = data.get("download", {}).get("bandwidth")
-            upload = data.get("upload", {}).get("bandwidth")
-            ping = data.get("ping", {}).get("latency")
-            download_mbps = download * 8 / 1_000_000 if download is not None else None
-            upload_mbps = upload * 8 / 1_000_000 if upload is not None else None
-            return download_mbps, upload_mbps, ping
-
+    def _parse_cli(self, output: bytes) -> Speeds:
+        data = _load_report(output)
+        if data is None:
+            return None, None, None
         # speedtest-cli variant returns bits per second
         download = data.get("download")
         upload = data.get("upload")
         ping = data.get("ping")
-        download_mbps = download / 1_000_000 if download is not None else None
-        upload_mbps = upload / 1_000_000 if upload is not None else None
+        download_mbps = download / _CLI_BITS_PER_MBIT if download is not None else None
+        upload_mbps = upload / _CLI_BITS_PER_MBIT if upload is not None else None
         return download_mbps, upload_mbps, ping